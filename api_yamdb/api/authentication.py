@@ -0,0 +1,172 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import ADMIN, MODERATOR, USER, User
+
+ROLE_CLAIM = 'role'
+IS_STAFF_CLAIM = 'is_staff'
+VERSION_CLAIM = 'token_version'
+TOKEN_VERSION_KEY = 'api:token_version:{user_id}'
+TOKEN_REVOKED = 'Токен отозван, получите новый.'
+
+
+class UserCache:
+    """Пользователи процесса с ограничением по времени и размеру.
+
+    Старые записи вытесняются первыми. Запись удаляется сигналами при
+    изменении или удалении пользователя в этом процессе; в остальных
+    процессах она устаревает не позже чем через ttl секунд.
+    """
+
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.users = OrderedDict()
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.users.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                del self.users[user_id]
+                return None
+            self.users.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user):
+        with self.lock:
+            self.users[user_id] = (time.monotonic() + self.ttl, user)
+            self.users.move_to_end(user_id)
+            while len(self.users) > self.size:
+                self.users.popitem(last=False)
+
+    def delete(self, user_id):
+        with self.lock:
+            self.users.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.users.clear()
+
+
+user_cache = UserCache(
+    settings.JWT_USER_CACHE_SIZE, settings.JWT_USER_CACHE_TTL)
+
+
+def get_token_version(user_id):
+    """Текущая версия токенов активного пользователя или None.
+
+    Версия сбрасывается сигналом, а в процессах без общего кэша
+    устаревает через JWT_USER_CACHE_TTL секунд.
+    """
+    key = TOKEN_VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id, is_active=True,
+        ).values_list('token_version', flat=True).first()
+        if version is not None:
+            cache.set(key, version, settings.JWT_USER_CACHE_TTL)
+    return version
+
+
+def forget_token_version(user_id):
+    cache.delete(TOKEN_VERSION_KEY.format(user_id=user_id))
+
+
+def get_access_token(user):
+    """Токен доступа; с JWT_ROLE_CLAIMS - с ролью и версией токенов."""
+    token = AccessToken.for_user(user)
+    if settings.JWT_ROLE_CLAIMS:
+        token[ROLE_CLAIM] = user.role
+        token[IS_STAFF_CLAIM] = user.is_staff
+        token[VERSION_CLAIM] = user.token_version
+    return token
+
+
+class TokenUser(SimpleLazyObject):
+    """Пользователь из утверждений токена.
+
+    id, роль, is_staff и версия токенов берутся из токена, поэтому
+    проверки прав не обращаются к БД. Остальные атрибуты загружают
+    пользователя при первом обращении.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token, load):
+        super().__init__(load)
+        self.__dict__.update(
+            id=token[api_settings.USER_ID_CLAIM],
+            pk=token[api_settings.USER_ID_CLAIM],
+            role=token[ROLE_CLAIM],
+            is_staff=token[IS_STAFF_CLAIM],
+            token_version=token[VERSION_CLAIM],
+        )
+
+    @property
+    def is_user(self):
+        return self.role == USER
+
+    @property
+    def is_moderator(self):
+        return self.role == MODERATOR
+
+    @property
+    def is_admin(self):
+        return self.role == ADMIN or self.is_staff
+
+    def __eq__(self, other):
+        if isinstance(other, TokenUser):
+            return self.pk == other.pk
+        return isinstance(other, User) and self.pk == other.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication, которая берёт пользователя из user_cache.
+
+    Неактивные и несуществующие пользователи не кэшируются. Каждый
+    запрос получает свою копию объекта, чтобы изменения в одном
+    запросе не попадали в другие. Для токенов с ролью возвращается
+    TokenUser, если версия токена совпадает с версией пользователя.
+    Копия может быть устаревшей, поэтому сохранять её нельзя: пути
+    записи загружают пользователя из БД заново.
+    """
+
+    def get_user(self, validated_token):
+        if ROLE_CLAIM not in validated_token:
+            return self.get_cached_user(validated_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if (
+            user_id is None
+            or validated_token.get(VERSION_CLAIM)
+            != get_token_version(user_id)
+        ):
+            raise AuthenticationFailed(TOKEN_REVOKED, code='token_revoked')
+        return TokenUser(
+            validated_token, lambda: self.get_cached_user(validated_token))
+
+    def get_cached_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = None if user_id is None else user_cache.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+        return copy.copy(user)
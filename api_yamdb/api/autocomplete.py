@@ -0,0 +1,156 @@
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from reviews.models import Category, Genre, Title
+from .cache import get_list_cache
+
+AUTOCOMPLETE_VERSION_KEY = 'api:autocomplete:version'
+TITLES = 'titles'
+GENRES = 'genres'
+CATEGORIES = 'categories'
+KINDS = (TITLES, GENRES, CATEGORIES)
+
+
+def normalize(text):
+    return ' '.join(text.casefold().replace('ё', 'е').split())
+
+
+def get_entries():
+    """Варианты подсказок каждого вида из БД."""
+    return {
+        TITLES: [
+            {'id': pk, 'name': name, 'year': year}
+            for pk, name, year in Title.objects.values_list(
+                'id', 'name', 'year').iterator()
+        ],
+        GENRES: list(Genre.objects.values('name', 'slug').iterator()),
+        CATEGORIES: list(Category.objects.values('name', 'slug').iterator()),
+    }
+
+
+class PrefixIndex:
+    """Отсортированные ключи для поиска по началу слова.
+
+    Для каждого варианта в индекс попадают название целиком и его
+    окончания, начинающиеся с каждого слова, поэтому «мир» находит
+    и «Мир», и «Война и мир». Поиск - двоичный по отсортированному
+    списку, без обращений к БД.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.keys = {}
+        for kind, items in entries.items():
+            keys = []
+            for position, item in enumerate(items):
+                words = normalize(item['name']).split(' ')
+                # Совпадение с началом названия выше совпадения со словом.
+                keys.extend(
+                    (' '.join(words[start:]), start > 0, position)
+                    for start in range(len(words))
+                )
+            keys.sort()
+            self.keys[kind] = (
+                [key for key, _, _ in keys],
+                [position for _, _, position in keys],
+            )
+
+    def lookup(self, kind, prefix, limit):
+        keys, positions = self.keys[kind]
+        prefix = normalize(prefix)
+        found = []
+        seen = set()
+        for index in range(bisect_left(keys, prefix), len(keys)):
+            if len(found) == limit or not keys[index].startswith(prefix):
+                break
+            if positions[index] not in seen:
+                seen.add(positions[index])
+                found.append(self.entries[kind][positions[index]])
+        return found
+
+
+class Autocomplete:
+    """Индекс подсказок процесса, общий для его потоков.
+
+    Версия индекса хранится в кэше LIST_CACHE_ALIAS, и после изменения
+    данных индекс перестраивают все процессы; для нескольких процессов
+    нужен общий кэш (Redis, Memcached), с кэшем в памяти остальные
+    процессы увидят изменения только через AUTOCOMPLETE_MAX_AGE. Версия
+    живёт не дольше AUTOCOMPLETE_MAX_AGE, так что изменения без сигналов
+    (массовая загрузка) тоже попадут в индекс. Индекс строится в
+    запросе только в первый раз, дальше перестраивается в фоновом
+    потоке, а запросы тем временем получают прежний индекс.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.index = None
+        self.version = None
+        self.thread = None
+
+    def get_index(self):
+        version = get_list_cache().get_or_set(
+            AUTOCOMPLETE_VERSION_KEY, time.time_ns,
+            settings.AUTOCOMPLETE_MAX_AGE)
+        if self.index is None:
+            with self.lock:
+                if self.index is None:
+                    self.index = PrefixIndex(get_entries())
+                    self.version = version
+            return self.index
+        index = self.index
+        if self.version != version:
+            self.refresh(version)
+        return index
+
+    def refresh(self, version):
+        """Запустить перестройку индекса, если она ещё не идёт."""
+        with self.lock:
+            if self.version == version or (
+                self.thread is not None and self.thread.is_alive()
+            ):
+                return
+            self.thread = threading.Thread(
+                target=self.rebuild, args=(version,), daemon=True)
+            self.thread.start()
+
+    def rebuild(self, version):
+        try:
+            index = PrefixIndex(get_entries())
+        finally:
+            # Соединение с БД у каждого потока своё.
+            connection.close()
+        with self.lock:
+            self.index = index
+            self.version = version
+
+    def wait(self):
+        """Дождаться окончания фоновой перестройки индекса."""
+        thread = self.thread
+        if thread is not None:
+            thread.join()
+
+    def clear(self):
+        self.wait()
+        with self.lock:
+            self.index = None
+            self.version = None
+
+    def lookup(self, prefix, kinds=KINDS, limit=None):
+        index = self.get_index()
+        limit = limit or settings.AUTOCOMPLETE_LIMIT
+        return {kind: index.lookup(kind, prefix, limit) for kind in kinds}
+
+
+autocomplete_index = Autocomplete()
+
+
+def invalidate_autocomplete():
+    """Перестроить индекс подсказок после фиксации транзакции."""
+    transaction.on_commit(lambda: get_list_cache().set(
+        AUTOCOMPLETE_VERSION_KEY, time.time_ns(),
+        settings.AUTOCOMPLETE_MAX_AGE))
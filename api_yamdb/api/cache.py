@@ -0,0 +1,87 @@
+import hashlib
+import threading
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+LIST_CACHE_KEY = 'api:list:{label}:{version}:{digest}'
+LIST_VERSION_KEY = 'api:list:{label}:version'
+CACHE_HEADER = 'X-Cache'
+HIT = 'HIT'
+MISS = 'MISS'
+
+
+class CacheStats:
+    """Счётчики попаданий и промахов кэша списков."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self):
+        with self.lock:
+            self.hits += 1
+
+    def miss(self):
+        with self.lock:
+            self.misses += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+list_cache_stats = CacheStats()
+
+
+def get_list_cache():
+    return caches[settings.LIST_CACHE_ALIAS]
+
+
+def get_version_key(model):
+    return LIST_VERSION_KEY.format(label=model._meta.label_lower)
+
+
+def invalidate_list_cache(model):
+    """Сбросить все закэшированные списки модели сменой версии."""
+    get_list_cache().set(get_version_key(model), time.time_ns(), None)
+
+
+def get_list_cache_key(model, request):
+    version = get_list_cache().get_or_set(
+        get_version_key(model), time.time_ns, None)
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    digest = hashlib.sha256(
+        f'{request.get_host()}{request.path}?{query}'.encode()
+    ).hexdigest()
+    return LIST_CACHE_KEY.format(
+        label=model._meta.label_lower,
+        version=version,
+        digest=digest,
+    )
+
+
+class CachedListMixin:
+    """Кэширование ответа на запрос списка по параметрам запроса.
+
+    Кэш сбрасывается сигналами при изменении объектов модели.
+    """
+
+    def list(self, request, *args, **kwargs):
+        cache = get_list_cache()
+        key = get_list_cache_key(self.queryset.model, request)
+        data = cache.get(key)
+        if data is not None:
+            list_cache_stats.hit()
+            return Response(data, headers={CACHE_HEADER: HIT})
+        list_cache_stats.miss()
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.LIST_CACHE_TIMEOUT)
+        response[CACHE_HEADER] = MISS
+        return response
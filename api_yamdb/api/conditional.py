@@ -0,0 +1,83 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+
+ETAG_SOURCE = '{version}:{path}:{format}:{user}'
+USER_SOURCE = '{pk}:{role}:{is_staff}:{token_version}'
+
+
+class ConditionalGetMixin:
+    """Ответ 304 Not Modified на условные запросы списка и объекта.
+
+    Представление возвращает из get_version() версию данных и дату их
+    изменения. ETag строится из версии, адреса запроса и формата ответа,
+    поэтому при совпадении queryset и сериализатор не выполняются.
+    Если запрошены поля из user_fields, зависящие от пользователя, в
+    ETag входят его id, роль и версия токенов, ответ получает
+    Vary: Authorization, а Last-Modified не используется.
+    """
+
+    user_fields = ()
+
+    def get_version(self):
+        """Вернуть пару (версия, дата изменения) или (None, None)."""
+        raise NotImplementedError
+
+    def depends_on_user(self):
+        if not self.user_fields:
+            return False
+        fields = self.requested_fields or ()
+        return any(field in fields for field in self.user_fields)
+
+    def get_user_source(self, request):
+        user = request.user
+        if not user.is_authenticated:
+            return ''
+        return USER_SOURCE.format(
+            pk=user.pk,
+            role=user.role,
+            is_staff=user.is_staff,
+            token_version=user.token_version,
+        )
+
+    def get_etag(self, request, version, user=''):
+        return quote_etag(hashlib.sha1(ETAG_SOURCE.format(
+            version=version,
+            path=request.get_full_path(),
+            format=request.accepted_renderer.format,
+            user=user,
+        ).encode()).hexdigest())
+
+    def conditional(self, handler, request, *args, **kwargs):
+        version, modified = self.get_version()
+        if version is None:
+            return handler(request, *args, **kwargs)
+        depends_on_user = self.depends_on_user()
+        if depends_on_user:
+            etag = self.get_etag(
+                request, version, self.get_user_source(request))
+            modified = None
+        else:
+            etag = self.get_etag(request, version)
+        last_modified = int(modified.timestamp()) if modified else None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        if depends_on_user:
+            patch_vary_headers(response, ('Authorization',))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
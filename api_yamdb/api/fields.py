@@ -0,0 +1,70 @@
+from rest_framework import permissions, serializers
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+UNKNOWN_FIELDS = 'Неизвестные поля: {fields}.'
+
+
+def parse_fields(request, param):
+    value = request.query_params.get(param, '')
+    return [field.strip() for field in value.split(',') if field.strip()]
+
+
+def get_requested_fields(request, available, optional=()):
+    """Поля ответа из параметров fields и omit в порядке available.
+
+    Возвращает None, если параметров нет и нужны поля по умолчанию.
+    Поля optional выводятся, только если перечислены в fields.
+    """
+    if request is None or request.method not in permissions.SAFE_METHODS:
+        return None
+    fields = parse_fields(request, FIELDS_PARAM)
+    omit = parse_fields(request, OMIT_PARAM)
+    if not fields and not omit:
+        return None
+    unknown = set(fields + omit) - set(available)
+    if unknown:
+        raise serializers.ValidationError({FIELDS_PARAM: UNKNOWN_FIELDS.format(
+            fields=', '.join(sorted(unknown)))})
+    return tuple(
+        field for field in available
+        if (field in fields if fields else field not in optional)
+        and field not in omit
+    )
+
+
+class SparseFieldsSerializer:
+    """Сериализатор, который выводит только поля из контекста fields."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get(FIELDS_PARAM)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsMixin:
+    """Поддержка fields и omit для представлений с ModelSerializer.
+
+    Выбранные поля передаются сериализатору, а из БД читаются только
+    нужные им колонки.
+    """
+
+    @property
+    def requested_fields(self):
+        return get_requested_fields(
+            self.request, self.get_serializer_class().Meta.fields)
+
+    def get_serializer_context(self):
+        return {
+            **super().get_serializer_context(),
+            FIELDS_PARAM: self.requested_fields,
+        }
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.requested_fields
+        if fields is None:
+            return queryset
+        return queryset.only(self.lookup_field, *fields)
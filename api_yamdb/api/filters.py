@@ -1,15 +1,25 @@
 from django_filters import rest_framework as filters
 from reviews.models import Title
+from reviews.search import SEARCH_RANK, get_search_backend
 
 
 class TitleFilter(filters.FilterSet):
-    """Фильтрация произведений по категории, жанру, названию и году издания."""
+    """Фильтрация произведений по категории, жанру, названию и году издания.
+
+    Параметр search ищет по названию и описанию через полнотекстовый
+    индекс и сортирует результат по релевантности.
+    """
 
     category = filters.CharFilter(field_name='category__slug')
     genre = filters.CharFilter(field_name='genre__slug')
     name = filters.CharFilter(field_name='name')
     year = filters.NumberFilter(field_name='year')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('category', 'genre', 'name', 'year')
+        fields = ('category', 'genre', 'name', 'year', 'search')
+
+    def filter_search(self, queryset, name, value):
+        return get_search_backend().search(queryset, value).order_by(
+            SEARCH_RANK, 'id')
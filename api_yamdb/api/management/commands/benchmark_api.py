@@ -0,0 +1,251 @@
+import json
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import (CaptureQueriesContext,
+                               setup_test_environment,
+                               teardown_test_environment)
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.urls import router_v1
+from reviews.generators import SyntheticData
+from reviews.models import (ADMIN, Category, Comment, Genre, GenreTitle,
+                            Review, Title, User)
+
+BENCHMARK_USERNAME = 'benchmark_admin'
+BENCHMARK_SEED = 42
+PERCENTILES = 100
+STARTED_MESSAGE = 'Замеряем {count} маршрутов, по {requests} запросов'
+SEEDED_MESSAGE = ('Создан набор данных: {users} пользователей, '
+                  '{titles} произведений, {reviews} отзывов, '
+                  '{comments} комментариев')
+REPORT_MESSAGE = 'Отчёт записан в {output}'
+
+
+def percentile(samples, rank):
+    """Перцентиль rank (1-99) выборки."""
+    if len(samples) < 2:
+        return samples[0]
+    return statistics.quantiles(samples, n=PERCENTILES)[rank - 1]
+
+
+def explain(sql):
+    """План выполнения SQL-запроса в виде списка строк."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}')
+        return [
+            ' '.join(str(column) for column in row)
+            for row in cursor.fetchall()
+        ]
+
+
+def get_sample_kwargs(admin):
+    """Значения параметров маршрутов для существующих объектов.
+
+    Если объектов нет, значение None: такие маршруты не замеряются.
+    """
+    comment = Comment.objects.select_related('review').order_by('id').first()
+    review = comment.review if comment else Review.objects.first()
+    title_id = (
+        review.title_id if review
+        else Title.objects.values_list('id', flat=True).first()
+    )
+    return {
+        'title_id': title_id,
+        'review_id': review.id if review else None,
+        'titles': title_id,
+        'reviews': review.id if review else None,
+        'comments': comment.id if comment else None,
+        'categories': Category.objects.values_list('slug', flat=True).first(),
+        'genres': Genre.objects.values_list('slug', flat=True).first(),
+        'users': admin.username,
+    }
+
+
+def get_routes(sample):
+    """GET-маршруты всех представлений router_v1."""
+    routes = []
+    for prefix, viewset, basename in router_v1.registry:
+        for route in router_v1.get_routes(viewset):
+            # У MethodMapper свой метод get(), читаем как словарь.
+            action = dict(route.mapping).get('get')
+            if action is None or not hasattr(viewset, action):
+                continue
+            kwargs = {
+                name: sample[name] for name in ('title_id', 'review_id')
+                if f'<{name}>' in prefix
+            }
+            if route.detail and '{lookup}' in route.url:
+                kwargs[viewset.lookup_field] = sample[basename]
+            if None in kwargs.values():
+                continue
+            name = route.name.format(basename=basename)
+            routes.append((name, reverse(f'api:{name}', kwargs=kwargs)))
+    return routes
+
+
+class Command(BaseCommand):
+    """Замер задержки, запросов к БД и памяти для эндпоинтов API"""
+
+    help = ('Чтобы замерить производительность API, '
+            'выполните команду "python manage.py benchmark_api". '
+            'По умолчанию создаётся временная тестовая БД.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=100,
+            help='Количество пользователей в наборе данных.',
+        )
+        parser.add_argument(
+            '--titles',
+            type=int,
+            default=1000,
+            help='Количество произведений в наборе данных.',
+        )
+        parser.add_argument(
+            '--reviews',
+            type=int,
+            default=10000,
+            help='Примерное количество отзывов в наборе данных.',
+        )
+        parser.add_argument(
+            '--comments',
+            type=int,
+            default=20000,
+            help='Примерное количество комментариев в наборе данных.',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Количество замеров на маршрут.',
+        )
+        parser.add_argument(
+            '--use-existing-db',
+            action='store_true',
+            help='Замерять на текущей БД, не создавая данных.',
+        )
+        parser.add_argument(
+            '--explain',
+            action='store_true',
+            help='Добавить в отчёт планы выполнения SQL-запросов.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для отчёта в формате JSON, по умолчанию stdout.',
+        )
+
+    def handle(self, *args, **options):
+        if options['use_existing_db']:
+            report = self.run(options)
+        else:
+            report = self.run_in_test_db(options)
+        content = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(content)
+            self.stderr.write(REPORT_MESSAGE.format(output=options['output']))
+        else:
+            self.stdout.write(content)
+
+    def run_in_test_db(self, options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.stderr.write(SEEDED_MESSAGE.format(
+                **SyntheticData(BENCHMARK_SEED).generate(
+                    users=options['users'],
+                    titles=options['titles'],
+                    reviews=options['reviews'],
+                    comments=options['comments'],
+                )
+            ))
+            return self.run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    @staticmethod
+    @contextmanager
+    def get_client():
+        """Администратор для замеров и клиент с его JWT-токеном.
+
+        Созданный для замеров администратор удаляется после них, чтобы
+        не оставлять учётную запись в рабочей БД.
+        """
+        admin, created = User.objects.get_or_create(
+            username=BENCHMARK_USERNAME,
+            defaults={
+                'email': f'{BENCHMARK_USERNAME}@yamdb.fake',
+                'role': ADMIN,
+            },
+        )
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin)}')
+        try:
+            yield admin, client
+        finally:
+            if created:
+                admin.delete()
+
+    def run(self, options):
+        with self.get_client() as (admin, client):
+            return self.measure_routes(admin, client, options)
+
+    def measure_routes(self, admin, client, options):
+        routes = get_routes(get_sample_kwargs(admin))
+        self.stderr.write(STARTED_MESSAGE.format(
+            count=len(routes), requests=options['requests']))
+        return {
+            'dataset': {
+                model.__name__: model.objects.count()
+                for model in (User, Title, GenreTitle, Review, Comment)
+            },
+            'requests': options['requests'],
+            'routes': [
+                self.measure(
+                    client, name, url, options['requests'], options['explain'])
+                for name, url in routes
+            ],
+        }
+
+    @staticmethod
+    def measure(client, name, url, requests, with_plans=False):
+        """Замерить маршрут: задержки отдельно от запросов и памяти."""
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result = {
+            'route': name,
+            'url': url,
+            'status': response.status_code,
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'mean_ms': round(statistics.mean(latencies), 3),
+            'queries': len(context.captured_queries),
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+        if with_plans:
+            result['plans'] = [
+                {'sql': query['sql'], 'plan': explain(query['sql'])}
+                for query in context.captured_queries
+                if query['sql'].startswith('SELECT')
+            ]
+        return result
@@ -0,0 +1,72 @@
+import time
+from io import BytesIO
+
+from django.utils.module_loading import import_string
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONParser, FastJSONRenderer
+from .benchmark_api import Command as BenchmarkCommand
+from .benchmark_api import get_routes, get_sample_kwargs
+
+PAYLOAD_ROUTES = ('titles-list', 'reviews-list', 'comments-list')
+RENDERERS = (JSONRenderer, FastJSONRenderer)
+PARSERS = (JSONParser, FastJSONParser)
+
+
+class Command(BenchmarkCommand):
+    """Замер скорости JSON-рендереров и парсеров на ответах API"""
+
+    help = ('Чтобы сравнить JSON-рендереры и парсеры на списках '
+            'произведений, отзывов и комментариев, выполните команду '
+            '"python manage.py benchmark_json".')
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--renderer',
+            action='append',
+            help='Дополнительный класс рендерера, путь для импорта.',
+        )
+
+    def measure_routes(self, admin, client, options):
+        routes = dict(get_routes(get_sample_kwargs(admin)))
+        renderers = RENDERERS + tuple(
+            import_string(path) for path in options['renderer'] or ())
+        return {
+            'requests': options['requests'],
+            'payloads': [
+                self.measure_payload(
+                    name,
+                    client.get(routes[name]).data,
+                    options['requests'],
+                    renderers,
+                )
+                for name in PAYLOAD_ROUTES if name in routes
+            ],
+        }
+
+    @staticmethod
+    def timed(function, requests):
+        start = time.perf_counter()
+        for _ in range(requests):
+            function()
+        return round((time.perf_counter() - start) / requests * 1e6, 1)
+
+    def measure_payload(self, name, data, requests, renderers):
+        """Среднее время рендеринга и разбора ответа, в мкс."""
+        content = JSONRenderer().render(data)
+        return {
+            'route': name,
+            'bytes': len(content),
+            'render_us': {
+                renderer.__name__: self.timed(
+                    lambda: renderer().render(data), requests)
+                for renderer in renderers
+            },
+            'parse_us': {
+                parser.__name__: self.timed(
+                    lambda: parser().parse(BytesIO(content)), requests)
+                for parser in PARSERS
+            },
+        }
@@ -0,0 +1,172 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+from reviews.models import QueuedMail
+from .cache import list_cache_stats
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+UNMATCHED_ROUTE = 'unmatched'
+METRICS_AUTHORIZATION = 'Bearer {token}'
+METHODS = frozenset(
+    ('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS'))
+OTHER_METHOD = 'other'
+
+
+class Shard:
+    """Счётчики одного потока, изменяются без блокировок."""
+
+    def __init__(self, buckets_count):
+        self.requests = defaultdict(int)
+        self.durations = defaultdict(lambda: [0] * (buckets_count + 1))
+        self.duration_sums = defaultdict(float)
+        self.queries = defaultdict(int)
+
+
+class MetricsRegistry:
+    """Метрики запросов API в формате Prometheus.
+
+    Каждый поток пишет в свой набор счётчиков, блокировка нужна только
+    при первом запросе потока. При чтении наборы суммируются.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self.shards = []
+        self.local = threading.local()
+
+    def get_shard(self):
+        shard = getattr(self.local, 'shard', None)
+        if shard is None:
+            shard = Shard(len(self.buckets))
+            with self.lock:
+                self.shards.append(shard)
+            self.local.shard = shard
+        return shard
+
+    def observe(self, route, method, status, duration, queries):
+        # Метод задаёт клиент: прочие значения сводятся в одну серию.
+        if method not in METHODS:
+            method = OTHER_METHOD
+        shard = self.get_shard()
+        shard.requests[route, method, status] += 1
+        shard.durations[route][bisect_left(self.buckets, duration)] += 1
+        shard.duration_sums[route] += duration
+        shard.queries[route] += queries
+
+    def collect(self):
+        """Сложить счётчики всех потоков."""
+        requests = defaultdict(int)
+        durations = defaultdict(lambda: [0] * (len(self.buckets) + 1))
+        duration_sums = defaultdict(float)
+        queries = defaultdict(int)
+        with self.lock:
+            shards = list(self.shards)
+        for shard in shards:
+            # dict() копирует словарь целиком, пока поток его меняет.
+            for key, value in dict(shard.requests).items():
+                requests[key] += value
+            for route, counts in dict(shard.durations).items():
+                durations[route] = [
+                    total + count
+                    for total, count in zip(durations[route], counts)
+                ]
+            for route, value in dict(shard.duration_sums).items():
+                duration_sums[route] += value
+            for route, value in dict(shard.queries).items():
+                queries[route] += value
+        return requests, durations, duration_sums, queries
+
+    def render(self):
+        requests, durations, duration_sums, queries = self.collect()
+        lines = [
+            '# HELP api_requests_total Количество HTTP-запросов.',
+            '# TYPE api_requests_total counter',
+        ]
+        lines.extend(
+            f'api_requests_total{{route="{route}",method="{method}",'
+            f'status="{status}"}} {count}'
+            for (route, method, status), count in sorted(requests.items())
+        )
+        lines.extend((
+            '# HELP api_request_duration_seconds Время обработки запроса.',
+            '# TYPE api_request_duration_seconds histogram',
+        ))
+        for route, counts in sorted(durations.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(
+                    f'api_request_duration_seconds_bucket{{route="{route}",'
+                    f'le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f'api_request_duration_seconds_sum{{route="{route}"}} '
+                f'{duration_sums[route]:.6f}'
+            )
+            lines.append(
+                f'api_request_duration_seconds_count{{route="{route}"}} '
+                f'{cumulative}'
+            )
+        lines.extend((
+            '# HELP api_db_queries_total Количество запросов к БД.',
+            '# TYPE api_db_queries_total counter',
+        ))
+        lines.extend(
+            f'api_db_queries_total{{route="{route}"}} {count}'
+            for route, count in sorted(queries.items())
+        )
+        return lines
+
+
+registry = MetricsRegistry(settings.METRICS_BUCKETS)
+
+
+def render_cache_metrics():
+    stats = list_cache_stats.snapshot()
+    total = stats['hits'] + stats['misses']
+    return [
+        '# HELP api_list_cache_requests_total Обращения к кэшу списков.',
+        '# TYPE api_list_cache_requests_total counter',
+        f'api_list_cache_requests_total{{result="hit"}} {stats["hits"]}',
+        f'api_list_cache_requests_total{{result="miss"}} {stats["misses"]}',
+        '# HELP api_list_cache_hit_ratio Доля попаданий в кэш списков.',
+        '# TYPE api_list_cache_hit_ratio gauge',
+        f'api_list_cache_hit_ratio {stats["hits"] / total if total else 0}',
+    ]
+
+
+def render_mail_metrics():
+    return [
+        '# HELP api_mail_queue_depth Письма, ожидающие отправки.',
+        '# TYPE api_mail_queue_depth gauge',
+        'api_mail_queue_depth '
+        f'{QueuedMail.objects.filter(sent__isnull=True).count()}',
+    ]
+
+
+def metrics(request):
+    """Метрики API для Prometheus.
+
+    Доступны, только если сбор включён, с внутренних адресов и с токеном
+    METRICS_TOKEN; без заданного токена доступ закрыт.
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    token = request.META.get('HTTP_AUTHORIZATION', '')
+    if (
+        not settings.METRICS_TOKEN
+        or request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS
+        or not constant_time_compare(
+            token, METRICS_AUTHORIZATION.format(token=settings.METRICS_TOKEN))
+    ):
+        return HttpResponseForbidden()
+    lines = (
+        registry.render() + render_cache_metrics() + render_mail_metrics()
+    )
+    return HttpResponse('\n'.join(lines) + '\n', content_type=CONTENT_TYPE)
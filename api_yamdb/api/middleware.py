@@ -0,0 +1,140 @@
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .metrics import UNMATCHED_ROUTE, registry
+
+SERVER_TIMING = (
+    'db;dur={db_ms:.2f};desc="{queries} queries", '
+    'app;dur={duration_ms:.2f}'
+)
+
+slow_request_logger = logging.getLogger('api.slow_requests')
+
+
+class QueryRecorder:
+    """Сбор SQL-запросов и их длительности через execute_wrapper."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @property
+    def total_ms(self):
+        return sum(duration for _, duration in self.queries) * 1000
+
+    def slowest(self, count):
+        return [
+            {'sql': sql, 'ms': round(duration * 1000, 3)}
+            for sql, duration in sorted(
+                self.queries, key=lambda query: query[1], reverse=True,
+            )[:count]
+        ]
+
+    def duplicates(self):
+        return [
+            {'sql': sql, 'count': count}
+            for sql, count in Counter(sql for sql, _ in self.queries).items()
+            if count > 1
+        ]
+
+    def record(self):
+        """Контекст, в котором запросы всех БД попадают в запись."""
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+        return stack
+
+
+class QueryCounter:
+    """Подсчёт SQL-запросов без записи их текста и времени."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    record = QueryRecorder.record
+
+
+class MetricsMiddleware:
+    """Сбор метрик запросов для эндпоинта /metrics.
+
+    Для каждого маршрута считает ответы по методу и статусу, время
+    обработки и число запросов к БД. Отключается настройкой
+    METRICS_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with counter.record():
+            response = self.get_response(request)
+        match = request.resolver_match
+        registry.observe(
+            route=match.view_name if match else UNMATCHED_ROUTE,
+            method=request.method,
+            status=response.status_code,
+            duration=time.perf_counter() - start,
+            queries=counter.count,
+        )
+        return response
+
+
+class SQLProfilingMiddleware:
+    """Профилирование SQL-запросов каждого HTTP-запроса.
+
+    Включается настройкой SQL_PROFILING. Добавляет заголовок
+    Server-Timing с числом и временем запросов к БД, а запросы дольше
+    SQL_PROFILING_SLOW_REQUEST_MS пишет в лог api.slow_requests в виде
+    JSON с самыми медленными и повторяющимися SQL-запросами.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SQL_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with recorder.record():
+            response = self.get_response(request)
+        duration_ms = (time.perf_counter() - start) * 1000
+        response['Server-Timing'] = SERVER_TIMING.format(
+            db_ms=recorder.total_ms,
+            queries=len(recorder.queries),
+            duration_ms=duration_ms,
+        )
+        if duration_ms >= settings.SQL_PROFILING_SLOW_REQUEST_MS:
+            slow_request_logger.warning(json.dumps({
+                'method': request.method,
+                'path': request.get_full_path(),
+                'status': response.status_code,
+                'duration_ms': round(duration_ms, 3),
+                'queries': len(recorder.queries),
+                'db_ms': round(recorder.total_ms, 3),
+                'slowest': recorder.slowest(
+                    settings.SQL_PROFILING_SLOWEST_QUERIES),
+                'duplicates': recorder.duplicates(),
+            }, ensure_ascii=False))
+        return response
@@ -0,0 +1,60 @@
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    PageNumberPagination,
+)
+
+PAGINATION_PARAM = 'pagination'
+PAGE_MODE = 'page'
+CURSOR_MODE = 'cursor'
+
+
+class PageOrCursorPagination(BasePagination):
+    """Постраничная пагинация с переключением в режим курсора.
+
+    По умолчанию работает как PageNumberPagination. Режим курсора
+    включается параметром запроса ?pagination=cursor или атрибутом
+    представления pagination_mode. Курсор строится по полям
+    cursor_ordering представления: глубокие страницы стоят столько же,
+    сколько первая, а COUNT(*) не выполняется.
+    """
+
+    def __init__(self):
+        self.paginator = PageNumberPagination()
+
+    def get_mode(self, request, view):
+        mode = request.query_params.get(
+            PAGINATION_PARAM,
+            getattr(view, 'pagination_mode', PAGE_MODE),
+        )
+        if mode == CURSOR_MODE and getattr(view, 'cursor_ordering', None):
+            return CURSOR_MODE
+        return PAGE_MODE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.get_mode(request, view) == CURSOR_MODE:
+            self.paginator = CursorPagination()
+            self.paginator.ordering = view.cursor_ordering
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_results(self, data):
+        return self.paginator.get_results(data)
+
+    def get_schema_fields(self, view):
+        return self.paginator.get_schema_fields(view)
+
+    def get_schema_operation_parameters(self, view):
+        return self.paginator.get_schema_operation_parameters(view)
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
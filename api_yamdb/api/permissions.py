@@ -1,3 +1,5 @@
+from types import SimpleNamespace
+
 from rest_framework import permissions
 
 NOT_ALLOWED_TO_CHANGE = 'У вас недостаточно прав.'
@@ -54,4 +56,28 @@ class IsAuthor(permissions.BasePermission):
         return request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
-        return request.user == obj.author
+        return request.user.pk == obj.author_id
+
+
+def get_allowed_authors(view, method, author_ids):
+    """Авторы из author_ids, объекты которых пользователь может менять.
+
+    Разрешения представления проверяются для запроса method один раз на
+    автора, а не на каждый объект, и без запросов к БД; подходит для
+    представлений, где права на объект зависят только от его автора.
+    """
+    request = SimpleNamespace(method=method, user=view.request.user)
+    permissions = view.get_permissions()
+    if not all(
+        permission.has_permission(request, view)
+        for permission in permissions
+    ):
+        return set()
+    return {
+        author_id for author_id in author_ids
+        if all(
+            permission.has_object_permission(
+                request, view, SimpleNamespace(author_id=author_id))
+            for permission in permissions
+        )
+    }
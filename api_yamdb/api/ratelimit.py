@@ -0,0 +1,159 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+RATE_LIMIT_KEY = 'ratelimit:{scope}:{kind}:{value}'
+IP = 'ip'
+USER = 'user'
+PERIODS = {'s': 1, 'min': 60, 'hour': 3600, 'day': 86400}
+INVALID_RATE = 'Неверный лимит "{rate}", ожидается вида "5/min".'
+
+
+def parse_rate(rate):
+    """Ёмкость корзины и скорость её пополнения в токенах в секунду."""
+    try:
+        count, period = rate.split('/')
+        capacity = int(count)
+        return capacity, capacity / PERIODS[period]
+    except (KeyError, ValueError):
+        raise ValueError(INVALID_RATE.format(rate=rate))
+
+
+def take_token(state, now, capacity, rate):
+    """Взять токен из корзины (tokens, updated).
+
+    Возвращает новое состояние корзины и сколько секунд ждать, если
+    токенов нет.
+    """
+    tokens, updated = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) / rate
+
+
+class LocalRateLimitBackend:
+    """Корзины токенов в памяти процесса.
+
+    Лимит действует отдельно в каждом процессе. Хранится не больше
+    RATE_LIMIT_MAX_KEYS корзин: давно не использованные вытесняются
+    первыми и при следующем запросе начинаются заново полными.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = OrderedDict()
+
+    def take(self, key, capacity, rate):
+        now = time.monotonic()
+        with self.lock:
+            state, wait = take_token(
+                self.buckets.get(key), now, capacity, rate)
+            self.buckets[key] = state
+            self.buckets.move_to_end(key)
+            while len(self.buckets) > settings.RATE_LIMIT_MAX_KEYS:
+                self.buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class CacheRateLimitBackend:
+    """Корзины токенов в общем кэше RATE_LIMIT_CACHE_ALIAS.
+
+    Лимит общий для всех процессов. Чтение и запись корзины не
+    атомарны, поэтому при одновременных запросах лимит приблизителен.
+    """
+
+    @property
+    def cache(self):
+        return caches[settings.RATE_LIMIT_CACHE_ALIAS]
+
+    def take(self, key, capacity, rate):
+        state, wait = take_token(
+            self.cache.get(key), time.time(), capacity, rate)
+        # Полная корзина не отличается от отсутствующей.
+        self.cache.set(key, state, int((capacity - state[0]) / rate) + 1)
+        return wait
+
+    def clear(self):
+        pass
+
+
+backends = {}
+
+
+def get_rate_limit_backend():
+    path = settings.RATE_LIMIT_BACKEND
+    if path not in backends:
+        backends[path] = import_string(path)()
+    return backends[path]
+
+
+class RateLimited(Throttled):
+    default_detail = 'Слишком много запросов.'
+    extra_detail_singular = 'Повторите через {wait} с.'
+    extra_detail_plural = 'Повторите через {wait} с.'
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Ограничение частоты запросов по корзинам токенов.
+
+    Лимиты области scope (или rate_limit_scope представления) задаются
+    в RATE_LIMITS: для IP-адреса (ip, с учётом NUM_PROXIES), пользователя
+    (user) и любых полей тела запроса, например username и email.
+    Запрос отклоняется с ответом 429 и заголовком Retry-After, если
+    пуста хотя бы одна корзина; проверка выполняется до обработчика
+    представления.
+    """
+
+    scope = None
+
+    def get_value(self, request, kind):
+        if kind == IP:
+            return self.get_ident(request)
+        if kind == USER:
+            return request.user.pk if request.user.is_authenticated else None
+        # Тело ещё не проверено сериализатором и может быть не объектом.
+        if not isinstance(request.data, Mapping):
+            return None
+        value = request.data.get(kind)
+        return value.strip().lower() if isinstance(value, str) else None
+
+    def allow_request(self, request, view):
+        scope = self.scope or getattr(view, 'rate_limit_scope', None)
+        limits = settings.RATE_LIMITS.get(scope, {})
+        backend = get_rate_limit_backend()
+        wait = 0
+        for kind, rate in limits.items():
+            value = self.get_value(request, kind)
+            if not value:
+                continue
+            # Значения из тела не проверены: хэш даёт ключ допустимой
+            # длины и без спецсимволов для любого бэкенда кэша.
+            digest = hashlib.sha256(str(value).encode()).hexdigest()
+            wait = max(wait, backend.take(
+                RATE_LIMIT_KEY.format(scope=scope, kind=kind, value=digest),
+                *parse_rate(rate),
+            ))
+        if wait:
+            raise RateLimited(wait=wait)
+        return True
+
+
+class SignupRateThrottle(TokenBucketThrottle):
+    scope = 'signup'
+
+
+class TokenRateThrottle(TokenBucketThrottle):
+    scope = 'token'
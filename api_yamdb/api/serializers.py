@@ -1,15 +1,23 @@
+from collections import defaultdict
+
+from django.conf import settings
 from rest_framework import serializers
-from rest_framework.generics import get_object_or_404
 from rest_framework.relations import SlugRelatedField
 
 from reviews.models import (
     EMAIL_LENGTH, USER_NAME_LENGTH,
-    Category, Comment, Genre, Review, Title, User,
+    Category, Comment, Genre, GenreTitle, Review, Title, User,
 )
+from reviews.ratings import average
 from reviews.validators import validate_username, validate_year
+from .autocomplete import KINDS
+from .fields import SparseFieldsSerializer
+from .permissions import get_allowed_authors
+from .values import ValuesSerializer
 
-
-NOT_UNIQUE_REVIEW = 'Вы не можете добавить более одного отзыва на произведение'
+# Поле без привязки к сериализатору, чтобы даты выводились как в DRF.
+DATETIME_FIELD = serializers.DateTimeField()
+ACTION_METHODS = {'can_edit': 'PATCH', 'can_delete': 'DELETE'}
 
 
 class ValidateUsername:
@@ -42,7 +50,29 @@ class TokenSerializer(serializers.Serializer, ValidateUsername):
     )
 
 
-class UserSerializer(serializers.ModelSerializer, ValidateUsername):
+class AutocompleteSerializer(serializers.Serializer):
+    """Параметры запроса подсказок."""
+
+    q = serializers.CharField(
+        required=True,
+        trim_whitespace=False,
+    )
+    type = serializers.MultipleChoiceField(
+        choices=KINDS,
+        required=False,
+    )
+    limit = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=settings.AUTOCOMPLETE_MAX_LIMIT,
+    )
+
+
+class UserSerializer(
+    SparseFieldsSerializer,
+    serializers.ModelSerializer,
+    ValidateUsername,
+):
     """Сериализация данных пользователя."""
 
     class Meta:
@@ -138,19 +168,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only=True,
     )
 
-    def validate(self, data):
-        request = self.context['request']
-        if request.method == 'POST':
-            if Review.objects.filter(
-                title=get_object_or_404(
-                    Title,
-                    id=self.context['view'].kwargs.get('title_id')
-                ),
-                author=request.user
-            ).exists():
-                raise serializers.ValidationError(NOT_UNIQUE_REVIEW)
-        return data
-
     class Meta:
         model = Review
         fields = (
@@ -178,3 +195,98 @@ class CommentSerializer(serializers.ModelSerializer):
             'author',
             'pub_date',
         )
+
+
+class ShowTitleValuesSerializer(ValuesSerializer):
+    """Чтение произведений, результат как у ShowTitleSerializer."""
+
+    lookups = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'rating': ('rating_sum', 'rating_count'),
+        'description': ('description',),
+        'genre': ('id',),
+        'category': ('category__name', 'category__slug'),
+    }
+
+    def prepare(self, rows):
+        self.genres = defaultdict(list)
+        if 'genre' not in self.fields:
+            return
+        for title_id, name, slug in GenreTitle.objects.filter(
+            title_id__in=[row['id'] for row in rows],
+        ).order_by(
+            'genre__name', 'genre_id',
+        ).values_list('title_id', 'genre__name', 'genre__slug'):
+            self.genres[title_id].append({'name': name, 'slug': slug})
+
+    @staticmethod
+    def get_rating(row):
+        return average(row['rating_sum'], row['rating_count'])
+
+    def get_genre(self, row):
+        return self.genres[row['id']]
+
+    @staticmethod
+    def get_category(row):
+        if row['category__slug'] is None:
+            return None
+        return {'name': row['category__name'], 'slug': row['category__slug']}
+
+
+class AuthoredValuesSerializer(ValuesSerializer):
+    """Чтение объектов с автором и полями can_edit и can_delete.
+
+    Поля выводятся по запросу (?fields=...,can_edit,can_delete) и
+    считаются по разрешениям представления сразу для всей страницы.
+    """
+
+    optional = tuple(ACTION_METHODS)
+
+    def prepare(self, rows):
+        self.allowed = {}
+        fields = [field for field in ACTION_METHODS if field in self.fields]
+        if not fields:
+            return
+        author_ids = {row['author_id'] for row in rows}
+        for field in fields:
+            self.allowed[field] = get_allowed_authors(
+                self.context['view'], ACTION_METHODS[field], author_ids)
+
+    def get_can_edit(self, row):
+        return row['author_id'] in self.allowed['can_edit']
+
+    def get_can_delete(self, row):
+        return row['author_id'] in self.allowed['can_delete']
+
+    @staticmethod
+    def get_pub_date(row):
+        return DATETIME_FIELD.to_representation(row['pub_date'])
+
+
+class ReviewValuesSerializer(AuthoredValuesSerializer):
+    """Чтение отзывов, результат как у ReviewSerializer."""
+
+    lookups = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'score': ('score',),
+        'pub_date': ('pub_date',),
+        'can_edit': ('author_id',),
+        'can_delete': ('author_id',),
+    }
+
+
+class CommentValuesSerializer(AuthoredValuesSerializer):
+    """Чтение комментариев, результат как у CommentSerializer."""
+
+    lookups = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'pub_date': ('pub_date',),
+        'can_edit': ('author_id',),
+        'can_delete': ('author_id',),
+    }
@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, Title, User
+from .authentication import forget_token_version, user_cache
+from .autocomplete import invalidate_autocomplete
+from .cache import invalidate_list_cache
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def slug_name_changed(sender, **kwargs):
+    """Сбросить кэш списков категорий и жанров при их изменении."""
+    invalidate_list_cache(sender)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def autocomplete_changed(sender, **kwargs):
+    """Перестроить индекс подсказок при изменении его источников."""
+    invalidate_autocomplete()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Убрать пользователя и версию его токенов из кэшей."""
+    user_cache.delete(instance.pk)
+    forget_token_version(instance.pk)
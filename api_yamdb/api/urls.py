@@ -8,6 +8,7 @@ from .views import (
     ReviewViewSet,
     TitleViewSet,
     UserViewSet,
+    autocomplete,
     signup,
     token,
 )
@@ -52,6 +53,7 @@ signup_token_path = [
     path('auth/token/', token, name='token'),
 ]
 urlpatterns = [
+    path('v1/autocomplete/', autocomplete, name='autocomplete'),
     path('v1/', include(router_v1.urls)),
     path('v1/', include(signup_token_path)),
 ]
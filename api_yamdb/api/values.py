@@ -0,0 +1,119 @@
+from operator import itemgetter
+
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from .fields import get_requested_fields
+
+
+class ValuesSerializer:
+    """Сериализация для чтения из строк queryset.values().
+
+    Не создаёт поля DRF для каждого объекта; наследники собирают из
+    строк те же словари, что и обычный сериализатор представления.
+    lookups задаёт поля ответа по порядку и поля values(), из которых
+    они строятся. Поле выводится методом get_<поле>(), а без него -
+    значением первого поля values(). Поля optional выводятся, только
+    если запрошены явно.
+    """
+
+    lookups = {}
+    optional = ()
+
+    def __init__(self, rows, many=False, fields=None, context=None):
+        self.rows = rows
+        self.many = many
+        self.fields = self.default_fields() if fields is None else fields
+        self.context = context or {}
+        self.getters = [
+            (field, getattr(
+                self, f'get_{field}', itemgetter(self.lookups[field][0])))
+            for field in self.fields
+        ]
+
+    @classmethod
+    def default_fields(cls):
+        return tuple(
+            field for field in cls.lookups if field not in cls.optional)
+
+    @classmethod
+    def get_values(cls, queryset, fields=None, extra=()):
+        """Queryset строк только с колонками выбранных полей."""
+        if fields is None:
+            fields = cls.default_fields()
+        return queryset.values(*dict.fromkeys((
+            *(lookup for field in fields for lookup in cls.lookups[field]),
+            *extra,
+        )))
+
+    def prepare(self, rows):
+        """Загрузить связанные данные для всех строк разом."""
+
+    def to_representation(self, row):
+        return {field: getter(row) for field, getter in self.getters}
+
+    @property
+    def data(self):
+        rows = list(self.rows) if self.many else [self.rows]
+        self.prepare(rows)
+        data = [self.to_representation(row) for row in rows]
+        return data if self.many else data[0]
+
+
+class ValuesReadMixin:
+    """Список и объект через values_serializer_class.
+
+    Поддерживает параметры fields и omit: из БД читаются только колонки
+    выбранных полей. Изменяющие действия, как и чтение без
+    values_serializer_class, используют serializer_class.
+    """
+
+    values_serializer_class = None
+
+    @property
+    def requested_fields(self):
+        if self.values_serializer_class is None:
+            return None
+        return get_requested_fields(
+            self.request,
+            tuple(self.values_serializer_class.lookups),
+            self.values_serializer_class.optional,
+        )
+
+    def get_values_queryset(self):
+        # Для курсорной пагинации в строке нужны поля сортировки.
+        return self.values_serializer_class.get_values(
+            self.filter_queryset(self.get_queryset()),
+            self.requested_fields,
+            extra=[
+                field.lstrip('-')
+                for field in getattr(self, 'cursor_ordering', ())
+            ],
+        )
+
+    def get_values_serializer(self, rows, many=False):
+        return self.values_serializer_class(
+            rows, many=many, fields=self.requested_fields,
+            context=self.get_serializer_context(),
+        )
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.get_values_queryset()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                self.get_values_serializer(page, many=True).data)
+        return Response(self.get_values_serializer(queryset, many=True).data)
+
+    def retrieve(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return super().retrieve(request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            self.get_values_queryset(),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+        )
+        self.check_object_permissions(request, row)
+        return Response(self.get_values_serializer(row).data)
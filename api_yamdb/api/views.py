@@ -1,22 +1,25 @@
-import random
 
-from django.core.mail import send_mail
+from datetime import datetime, timezone
+
 from django.db import IntegrityError
-from django.db.models import Avg
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import filters, mixins, serializers, status, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import (
+    action, api_view, permission_classes, throttle_classes,
+)
 from rest_framework.permissions import (
     AllowAny,
     IsAuthenticated,
 )
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 
-from api_yamdb.settings import CODE_DEFAULT, CODE_LENGTH, EMAIL_FROM, SYMBOLS
+from api_yamdb.settings import EMAIL_FROM
+from reviews.codes import check_code, issue_code
+from reviews.mail import get_mail_queue
 from reviews.models import (
     Category,
     Genre,
@@ -24,7 +27,13 @@ from reviews.models import (
     Title,
     User
 )
+from reviews.ratings import get_titles_list_version
 from api_yamdb.settings import URL_PATH_NAME
+from .authentication import get_access_token
+from .autocomplete import KINDS, autocomplete_index
+from .cache import CachedListMixin
+from .conditional import ConditionalGetMixin
+from .fields import SparseFieldsMixin
 from .filters import TitleFilter
 from .permissions import (
     IsAdmin,
@@ -32,17 +41,24 @@ from .permissions import (
     IsAuthor,
     ReadOnly,
 )
+from .ratelimit import SignupRateThrottle, TokenRateThrottle
 from .serializers import (
+    ACTION_METHODS,
+    AutocompleteSerializer,
     CategorySerializer,
     CommentSerializer,
+    CommentValuesSerializer,
     GenreSerializer,
     ReviewSerializer,
+    ReviewValuesSerializer,
     ShowTitleSerializer,
+    ShowTitleValuesSerializer,
     SignUpSerializer,
     TitleSerializer,
     TokenSerializer,
     UserSerializer,
 )
+from .values import ValuesReadMixin
 
 
 # Send_mail info
@@ -57,10 +73,13 @@ BAD_TOKEN = (
     'Сгенерировать новый можно по адресу: {url}. '
     'Отправим код на почту, указанную при регистрации.'
 )
+# ReviewViewSet
+NOT_UNIQUE_REVIEW = 'Вы не можете добавить более одного отзыва на произведение'
 
 
 @api_view(['POST'])
 @permission_classes((AllowAny,))
+@throttle_classes((SignupRateThrottle,))
 def signup(request):
     """Представление для получения кода подтверждения."""
     serializer = SignUpSerializer(data=request.data)
@@ -77,16 +96,13 @@ def signup(request):
             else USER_NOT_UNIQUE_EMAIL.format(email=email),
             status=status.HTTP_400_BAD_REQUEST,
         )
-    user.confirmation_code = ''.join(random.sample(SYMBOLS, CODE_LENGTH))
-    user.save()
-    send_mail(
+    get_mail_queue().put(
         EMAIL_SUBJECT,
         EMAIL_TEXT.format(
             username=username,
-            confirmation_code=user.confirmation_code),
+            confirmation_code=issue_code(user)),
         EMAIL_FROM,
         [user.email],
-        fail_silently=False,
     )
     return Response(
         serializer.data, status=status.HTTP_200_OK)
@@ -94,6 +110,7 @@ def signup(request):
 
 @api_view(['POST'])
 @permission_classes((AllowAny,))
+@throttle_classes((TokenRateThrottle,))
 def token(request):
     """Представление для получения токена."""
     serializer = TokenSerializer(data=request.data)
@@ -101,22 +118,31 @@ def token(request):
     username = serializer.validated_data['username']
     confirmation_code = serializer.validated_data['confirmation_code']
     user = get_object_or_404(User, username=username)
-    if (
-        confirmation_code == user.confirmation_code
-        and confirmation_code != CODE_DEFAULT
-    ):
+    if check_code(user, confirmation_code):
         token = {
-            'token': str(AccessToken.for_user(user)),
+            'token': str(get_access_token(user)),
         }
         return Response(
             token, status=status.HTTP_200_OK)
-    user.confirmation_code = CODE_DEFAULT
-    user.save()
     raise serializers.ValidationError(
         BAD_TOKEN.format(url=reverse('api:signup')))
 
 
-class UserViewSet(viewsets.ModelViewSet):
+@api_view(['GET'])
+@permission_classes((AllowAny,))
+def autocomplete(request):
+    """Подсказки по началу названия произведений, жанров и категорий."""
+    serializer = AutocompleteSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    kinds = serializer.validated_data.get('type')
+    return Response(autocomplete_index.lookup(
+        serializer.validated_data['q'],
+        kinds=[kind for kind in KINDS if not kinds or kind in kinds],
+        limit=serializer.validated_data.get('limit'),
+    ))
+
+
+class UserViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """Представление для получения данных о пользователях."""
 
     queryset = User.objects.all()
@@ -138,25 +164,54 @@ class UserViewSet(viewsets.ModelViewSet):
             return Response(
                 self.get_serializer(request.user).data,
                 status=status.HTTP_200_OK)
+        # request.user может быть копией из кэша аутентификации, поэтому
+        # изменения сохраняются в свежую строку пользователя.
+        user = get_object_or_404(User, pk=request.user.pk)
         serializer = self.get_serializer(
-            request.user,
+            user,
             data=request.data,
             partial=True,
         )
         serializer.is_valid(raise_exception=True)
-        serializer.save(partial=True, role=request.user.role)
+        serializer.save(partial=True, role=user.role)
         return Response(
             serializer.data, status=status.HTTP_200_OK)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    ConditionalGetMixin,
+    ValuesReadMixin,
+    viewsets.ModelViewSet,
+):
     """Представление для произведений."""
 
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score')).order_by('name')
+    queryset = Title.objects.select_related(
+        'category',
+    ).prefetch_related(
+        'genre',
+    ).order_by('name')
     permission_classes = (ReadOnly | IsAdmin,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    cursor_ordering = ('name', 'id')
+    values_serializer_class = ShowTitleValuesSerializer
+
+    def get_version(self):
+        if self.action == 'retrieve':
+            try:
+                title = Title.objects.filter(
+                    pk=self.kwargs[self.lookup_field],
+                ).values('version', 'modified').first()
+            except ValueError:
+                title = None
+            if title is None:
+                return None, None
+            return title['version'], title['modified']
+        # Версия списка одна на все фильтры и страницы, поэтому запрос
+        # списка не перебирает таблицу произведений.
+        version = get_titles_list_version()
+        return version, datetime.fromtimestamp(
+            version / 10 ** 9, tz=timezone.utc)
 
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve',):
@@ -165,6 +220,7 @@ class TitleViewSet(viewsets.ModelViewSet):
 
 
 class CategoryGenreViewSet(
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     mixins.ListModelMixin,
@@ -192,37 +248,66 @@ class GenreViewSet(CategoryGenreViewSet):
     serializer_class = GenreSerializer
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    ConditionalGetMixin,
+    ValuesReadMixin,
+    viewsets.ModelViewSet,
+):
     """Представление для отзывов."""
 
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
+    user_fields = tuple(ACTION_METHODS)
     permission_classes = (ReadOnly | IsAdmin | IsModerator | IsAuthor,)
+    cursor_ordering = ('-pub_date', '-id')
 
-    def get_title(self):
+    @cached_property
+    def title(self):
         return get_object_or_404(Title, id=self.kwargs.get('title_id'))
 
+    def get_version(self):
+        return self.title.version, self.title.modified
+
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.title.reviews.select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
-
-
-class CommentViewSet(viewsets.ModelViewSet):
+        # Повторный отзыв отсекает ограничение unique_review при вставке;
+        # остальные ошибки целостности не выдаются за повторный отзыв.
+        try:
+            serializer.save(author=self.request.user, title=self.title)
+        except IntegrityError:
+            if self.title.reviews.filter(author=self.request.user).exists():
+                raise serializers.ValidationError(NOT_UNIQUE_REVIEW)
+            raise
+
+
+class CommentViewSet(
+    ConditionalGetMixin,
+    ValuesReadMixin,
+    viewsets.ModelViewSet,
+):
     """Представление для комментариев."""
 
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
+    user_fields = tuple(ACTION_METHODS)
     permission_classes = (ReadOnly | IsAdmin | IsModerator | IsAuthor,)
+    cursor_ordering = ('-pub_date', '-id')
 
-    def get_review(self):
+    @cached_property
+    def review(self):
         return get_object_or_404(
-            Review,
+            Review.objects.select_related('title'),
             id=self.kwargs.get('review_id'),
             title=self.kwargs.get('title_id'),
         )
 
+    def get_version(self):
+        return self.review.title.version, self.review.title.modified
+
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.review.comments.select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
+        serializer.save(author=self.request.user, review=self.review)
@@ -41,19 +41,38 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS':
-        'rest_framework.pagination.PageNumberPagination',
+        'api.pagination.PageOrCursorPagination',
     'PAGE_SIZE': 5,
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Число доверенных прокси перед приложением. При 0 IP клиента для
+    # ограничения частоты берётся из REMOTE_ADDR, а X-Forwarded-For,
+    # который клиент может подделать, не учитывается.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')),
 }
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
+JWT_USER_CACHE_SIZE = 1024
+JWT_USER_CACHE_TTL = 10
+# Роль и версия токенов в токене доступа, проверки прав без БД.
+JWT_ROLE_CLAIMS = os.getenv('JWT_ROLE_CLAIMS', '') == '1'
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.SQLProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -94,6 +113,45 @@ DATABASES = {
     }
 }
 
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+LIST_CACHE_ALIAS = 'default'
+LIST_CACHE_TIMEOUT = 300
+
+# SQL profiling
+SQL_PROFILING = os.getenv('SQL_PROFILING', '') == '1'
+SQL_PROFILING_SLOW_REQUEST_MS = 500
+SQL_PROFILING_SLOWEST_QUERIES = 5
+
+# Prometheus metrics
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '') == '1'
+# За обратным прокси все запросы приходят с его адреса, поэтому
+# /metrics дополнительно требует заголовок Authorization: Bearer <токен>.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = ('127.0.0.1', '::1')
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api.slow_requests': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
+}
+
 # User
 AUTH_USER_MODEL = 'reviews.User'
 
@@ -139,6 +197,37 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 EMAIL_FROM = 'pupkin@yamdb.ru'
 
+# Mail queue
+MAIL_QUEUE_BACKEND = 'reviews.mail.DatabaseMailQueue'
+MAIL_QUEUE_BATCH_SIZE = 100
+MAIL_QUEUE_MAX_ATTEMPTS = 5
+# Сколько секунд письмо занято отправляющим процессом.
+MAIL_QUEUE_LEASE = 300
+
+# Title search
+TITLE_SEARCH_BACKENDS = {
+    'sqlite': 'reviews.search.SQLiteSearchBackend',
+    'postgresql': 'reviews.search.PostgresSearchBackend',
+}
+TITLE_SEARCH_DEFAULT_BACKEND = 'reviews.search.SimpleSearchBackend'
+
+# Autocomplete
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+AUTOCOMPLETE_MAX_AGE = 600
+
+# Rate limits
+# LocalRateLimitBackend считает запросы в каждом процессе отдельно,
+# CacheRateLimitBackend - в общем кэше RATE_LIMIT_CACHE_ALIAS.
+RATE_LIMIT_BACKEND = os.getenv(
+    'RATE_LIMIT_BACKEND', 'api.ratelimit.LocalRateLimitBackend')
+RATE_LIMIT_CACHE_ALIAS = 'default'
+RATE_LIMIT_MAX_KEYS = 10000
+RATE_LIMITS = {
+    'signup': {'ip': '20/min', 'username': '5/min', 'email': '5/min'},
+    'token': {'ip': '30/min', 'username': '10/min'},
+}
+
 # Username
 REGEX = r'^[\w.@+-]+'
 URL_PATH_NAME = 'me'
@@ -146,5 +235,7 @@ BAD_NAMES = (URL_PATH_NAME,)
 
 # Confirmation code
 CODE_LENGTH = 5
-CODE_DEFAULT = '#' * CODE_LENGTH
+# Срок действия кода, секунды; просроченные коды удаляет
+# команда clear_confirmation_codes.
+CONFIRMATION_CODE_TTL = 3600
 SYMBOLS = string.digits + string.ascii_uppercase
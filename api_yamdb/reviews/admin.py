@@ -5,10 +5,12 @@ from .models import (
     Comment,
     Genre,
     GenreTitle,
+    QueuedMail,
     Review,
     Title,
     User,
 )
+from .search import get_search_backend
 
 
 CHAR_SLICE = 100
@@ -49,10 +51,15 @@ class TitleAdmin(admin.ModelAdmin):
     list_display = (
         'name', category_name, 'year', 'description'
     )
-    search_fields = ('name', 'category', 'year')
+    search_fields = ('name', 'description')
     list_filter = ('category', 'genre')
     empty_value_display = '-пусто-'
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return get_search_backend().search(queryset, search_term), False
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -102,7 +109,6 @@ class UserAdmin(admin.ModelAdmin):
         'id',
         'username',
         'email',
-        'confirmation_code',
         'first_name',
         'last_name',
         'bio',
@@ -111,3 +117,15 @@ class UserAdmin(admin.ModelAdmin):
     list_editable = ('role',)
     search_fields = ('username',)
     empty_value_display = '-пусто-'
+
+
+@admin.register(QueuedMail)
+class QueuedMailAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'to', 'subject', 'created', 'sent', 'attempts'
+    )
+    list_filter = ('sent',)
+    search_fields = ('to',)
+    # Текст содержит действующий код подтверждения.
+    exclude = ('body',)
+    empty_value_display = '-пусто-'
@@ -0,0 +1,57 @@
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from .models import ConfirmationCode
+
+KEY_SALT = 'reviews.codes.ConfirmationCode'
+
+
+def hash_code(code):
+    return salted_hmac(KEY_SALT, code, algorithm='sha256').hexdigest()
+
+
+def issue_code(user):
+    """Новый код подтверждения пользователя вместо прежнего.
+
+    Пишется только строка кода, строка пользователя не меняется.
+    """
+    code = ''.join(
+        secrets.choice(settings.SYMBOLS) for _ in range(settings.CODE_LENGTH))
+    values = {
+        'code_hash': hash_code(code),
+        'expires': timezone.now() + timedelta(
+            seconds=settings.CONFIRMATION_CODE_TTL),
+    }
+    if not ConfirmationCode.objects.filter(user=user).update(**values):
+        try:
+            with transaction.atomic():
+                ConfirmationCode.objects.create(user=user, **values)
+        except IntegrityError:
+            # Код уже создан параллельным запросом.
+            ConfirmationCode.objects.filter(user=user).update(**values)
+    return code
+
+
+def check_code(user, code):
+    """Погасить код пользователя.
+
+    Код одноразовый: верный код удаляется, а неверный удаляет и
+    действующий, так что нужно запросить новый.
+    """
+    used = ConfirmationCode.objects.filter(
+        user=user, code_hash=hash_code(code), expires__gt=timezone.now(),
+    ).delete()[0]
+    if not used:
+        ConfirmationCode.objects.filter(user=user).delete()
+    return bool(used)
+
+
+def clear_expired_codes():
+    """Удалить просроченные коды, вернуть их количество."""
+    return ConfirmationCode.objects.filter(
+        expires__lte=timezone.now()).delete()[0]
@@ -0,0 +1,153 @@
+import random
+from itertools import islice
+
+from django.db import transaction
+
+from .models import (MAX_SCORE, MIN_SCORE, Category, Comment, Genre,
+                     GenreTitle, Review, Title, User)
+from .ratings import recompute_ratings
+
+BATCH_SIZE = 5000
+CATEGORIES = 10
+GENRES = 30
+MIN_YEAR = 1900
+MAX_YEAR = 2020
+
+
+def batched(objects, batch_size):
+    """Разбить итератор на списки по batch_size."""
+    objects = iter(objects)
+    while True:
+        batch = list(islice(objects, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class SyntheticData:
+    """Генератор данных с распределениями, похожими на реальные.
+
+    Число отзывов на произведение подчиняется закону Ципфа, число
+    комментариев к отзыву - распределению Парето, у произведения может
+    быть несколько жанров. Случайность задаётся seed, поэтому набор
+    данных воспроизводим.
+    """
+
+    def __init__(self, seed, batch_size=BATCH_SIZE):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+
+    def bulk_insert(self, model, objects):
+        """Вставить объекты пачками; вернуть queryset id новых строк."""
+        last_id = model.objects.order_by('-id').values_list(
+            'id', flat=True).first() or 0
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch, ignore_conflicts=True)
+        return model.objects.filter(
+            id__gt=last_id).order_by('id').values_list('id', flat=True)
+
+    def users(self, count):
+        start = User.objects.count()
+        return self.bulk_insert(User, (
+            User(
+                username=f'user_{idx}',
+                email=f'user_{idx}@yamdb.fake',
+            ) for idx in range(start, start + count)
+        ))
+
+    def slug_names(self, model, count, name, slug):
+        ids = list(model.objects.values_list('id', flat=True))
+        if len(ids) >= count:
+            return ids
+        return ids + list(self.bulk_insert(model, (
+            model(name=f'{name} {idx}', slug=f'{slug}-{idx}')
+            for idx in range(len(ids), count)
+        )))
+
+    def titles(self, count, max_genres):
+        category_ids = self.slug_names(
+            Category, CATEGORIES, 'Категория', 'category')
+        genre_ids = self.slug_names(Genre, GENRES, 'Жанр', 'genre')
+        start = Title.objects.count()
+        title_ids = list(self.bulk_insert(Title, (
+            Title(
+                name=f'Произведение {idx}',
+                year=self.random.randint(MIN_YEAR, MAX_YEAR),
+                description=f'Описание произведения {idx}',
+                category_id=self.random.choice(category_ids),
+            ) for idx in range(start, start + count)
+        )))
+        # Чаще у произведения один-два жанра, реже - до max_genres.
+        self.bulk_insert(GenreTitle, (
+            GenreTitle(title_id=title_id, genre_id=genre_id)
+            for title_id in title_ids
+            for genre_id in self.random.sample(genre_ids, min(
+                max_genres,
+                len(genre_ids),
+                1 + int(self.random.expovariate(1)),
+            ))
+        ))
+        return title_ids
+
+    def zipf_counts(self, total, size, exponent, limit):
+        """Разложить total по size позициям по закону Ципфа."""
+        weights = [1 / rank ** exponent for rank in range(1, size + 1)]
+        scale = total / sum(weights)
+        counts = [
+            min(limit, int(weight * scale + self.random.random()))
+            for weight in weights
+        ]
+        self.random.shuffle(counts)
+        return counts
+
+    def reviews(self, title_ids, user_ids, total, exponent):
+        counts = self.zipf_counts(
+            total, len(title_ids), exponent, len(user_ids))
+        return self.bulk_insert(Review, (
+            Review(
+                title_id=title_id,
+                author_id=author_id,
+                text=f'Отзыв на произведение {title_id}',
+                score=min(MAX_SCORE, max(MIN_SCORE, round(
+                    self.random.gauss(quality, 2)))),
+            )
+            for title_id, count in zip(title_ids, counts)
+            for quality in (self.random.uniform(MIN_SCORE, MAX_SCORE),)
+            for author_id in self.random.sample(user_ids, count)
+        ))
+
+    def comments(self, review_ids, user_ids, total, alpha):
+        reviews_count = review_ids.count()
+        if not reviews_count:
+            return Comment.objects.none()
+        # Среднее распределения Парето alpha / (alpha - 1).
+        scale = total / reviews_count * (alpha - 1) / alpha
+        return self.bulk_insert(Comment, (
+            Comment(
+                review_id=review_id,
+                author_id=self.random.choice(user_ids),
+                text=f'Комментарий к отзыву {review_id}',
+            )
+            for review_id in review_ids.iterator()
+            for _ in range(int(
+                scale * self.random.paretovariate(alpha)
+                + self.random.random()
+            ))
+        ))
+
+    def generate(self, users, titles, reviews, comments,
+                 max_genres=5, zipf=1.1, pareto=1.5):
+        """Создать полный набор данных и пересчитать рейтинги."""
+        new_user_ids = self.users(users)
+        user_ids = list(User.objects.values_list('id', flat=True))
+        title_ids = self.titles(titles, max_genres)
+        review_ids = self.reviews(title_ids, user_ids, reviews, zipf)
+        comment_ids = self.comments(review_ids, user_ids, comments, pareto)
+        recompute_ratings(Title, Review)
+        return {
+            'users': new_user_ids.count(),
+            'titles': len(title_ids),
+            'reviews': review_ids.count(),
+            'comments': comment_ids.count(),
+        }
@@ -0,0 +1,128 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import QueuedMail
+
+
+class SyncMailQueue:
+    """Отправка писем сразу, в рамках запроса."""
+
+    def put(self, subject, message, from_email, recipient_list):
+        send_mail(
+            subject,
+            message,
+            from_email,
+            recipient_list,
+            fail_silently=False,
+        )
+
+
+class DatabaseMailQueue:
+    """Очередь писем в БД, которую разбирает send_queued_mail."""
+
+    def put(self, subject, message, from_email, recipient_list):
+        QueuedMail.objects.bulk_create(
+            QueuedMail(
+                subject=subject,
+                body=message,
+                from_email=from_email,
+                to=recipient,
+            )
+            for recipient in recipient_list
+        )
+
+    def pending(self, max_attempts):
+        return QueuedMail.objects.filter(
+            Q(locked_until__isnull=True) | Q(locked_until__lt=timezone.now()),
+            sent__isnull=True,
+            attempts__lt=max_attempts,
+        )
+
+    def claim(self, batch_size, max_attempts, after_id):
+        """Занять пачку писем на MAIL_QUEUE_LEASE секунд и вернуть её.
+
+        Транзакция короткая и завершается до отправки, поэтому запись в
+        очередь не ждёт SMTP. Письмо, результат отправки которого не
+        записан, после истечения аренды отправится повторно.
+        """
+        with transaction.atomic():
+            batch = list(self.pending(max_attempts).filter(
+                id__gt=after_id,
+            ).select_for_update(
+                skip_locked=True,
+            ).order_by('id')[:batch_size])
+            QueuedMail.objects.filter(
+                id__in=[queued.id for queued in batch],
+            ).update(
+                locked_until=timezone.now() + timedelta(
+                    seconds=settings.MAIL_QUEUE_LEASE),
+                attempts=F('attempts') + 1,
+            )
+        return batch
+
+    def send_batch(self, connection, batch_size, max_attempts, after_id=0):
+        """Отправить одну пачку писем через открытое соединение.
+
+        Берутся письма с id больше after_id, поэтому за один проход
+        неудачное письмо повторно не отправляется. Результат каждого
+        письма записывается сразу после его отправки.
+        Возвращает тройку (отправлено, ошибок, последний id).
+        """
+        sent = failed = 0
+        last_id = after_id
+        for queued in self.claim(batch_size, max_attempts, after_id):
+            last_id = queued.id
+            try:
+                connection.send_messages([EmailMessage(
+                    queued.subject,
+                    queued.body,
+                    queued.from_email,
+                    [queued.to],
+                )])
+            except Exception as error:
+                failed += 1
+                QueuedMail.objects.filter(id=queued.id).update(
+                    locked_until=None,
+                    last_error=str(error),
+                )
+            else:
+                sent += 1
+                # Текст письма с кодом подтверждения после отправки не нужен.
+                QueuedMail.objects.filter(id=queued.id).update(
+                    sent=timezone.now(),
+                    locked_until=None,
+                    body='',
+                )
+        return sent, failed, last_id
+
+    def drain(self, batch_size=None, max_attempts=None):
+        """Отправить все ожидающие письма пачками по одному соединению.
+
+        Возвращает пару (отправлено, ошибок).
+        """
+        batch_size = batch_size or settings.MAIL_QUEUE_BATCH_SIZE
+        max_attempts = max_attempts or settings.MAIL_QUEUE_MAX_ATTEMPTS
+        total_sent = total_failed = last_id = 0
+        with get_connection() as connection:
+            while True:
+                sent, failed, last_id = self.send_batch(
+                    connection, batch_size, max_attempts, last_id)
+                total_sent += sent
+                total_failed += failed
+                if sent + failed < batch_size:
+                    return total_sent, total_failed
+
+
+def delete_sent_mail():
+    """Удалить отправленные письма из очереди, вернуть их количество."""
+    return QueuedMail.objects.filter(sent__isnull=False).delete()[0]
+
+
+def get_mail_queue():
+    return import_string(settings.MAIL_QUEUE_BACKEND)()
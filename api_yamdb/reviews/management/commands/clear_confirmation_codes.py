@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from ...codes import clear_expired_codes
+from ...mail import delete_sent_mail
+
+SUCCESS_MESSAGE = (
+    'Удалено просроченных кодов: {deleted}, отправленных писем: {mail}'
+)
+
+
+class Command(BaseCommand):
+    """Удаление просроченных кодов и отправленных писем с кодами"""
+
+    help = ('Чтобы удалить просроченные коды подтверждения и '
+            'отправленные письма с ними, выполните команду '
+            '"python manage.py clear_confirmation_codes". '
+            'Команду удобно запускать по расписанию, например из cron.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(
+            SUCCESS_MESSAGE.format(
+                deleted=clear_expired_codes(),
+                mail=delete_sent_mail(),
+            )))
@@ -0,0 +1,95 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...generators import BATCH_SIZE, SyntheticData
+
+SUCCESS_MESSAGE = ('Создано за {seconds:.1f} с: пользователей {users}, '
+                   'произведений {titles}, отзывов {reviews}, '
+                   'комментариев {comments}')
+PARETO_ERROR = 'Параметр --pareto должен быть больше 1, получено {pareto}.'
+
+
+class Command(BaseCommand):
+    """Генерация синтетических данных для нагрузочного тестирования"""
+
+    help = ('Чтобы заполнить БД синтетическими данными, '
+            'выполните команду "python manage.py generate_data". '
+            'Отзывы распределяются по произведениям по закону Ципфа, '
+            'комментарии по отзывам - по закону Парето.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=1000,
+            help='Количество пользователей.',
+        )
+        parser.add_argument(
+            '--titles',
+            type=int,
+            default=10000,
+            help='Количество произведений.',
+        )
+        parser.add_argument(
+            '--reviews',
+            type=int,
+            default=100000,
+            help='Примерное общее количество отзывов.',
+        )
+        parser.add_argument(
+            '--comments',
+            type=int,
+            default=200000,
+            help='Примерное общее количество комментариев.',
+        )
+        parser.add_argument(
+            '--max-genres',
+            type=int,
+            default=5,
+            help='Наибольшее количество жанров у произведения.',
+        )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Показатель закона Ципфа для отзывов на произведение.',
+        )
+        parser.add_argument(
+            '--pareto',
+            type=float,
+            default=1.5,
+            help='Параметр распределения Парето для комментариев, > 1.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Зерно генератора случайных чисел.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество строк в одной вставке.',
+        )
+
+    def handle(self, *args, **options):
+        # При alpha <= 1 у распределения нет среднего, и масштаб для
+        # заданного числа комментариев не посчитать.
+        if options['pareto'] <= 1:
+            raise CommandError(PARETO_ERROR.format(pareto=options['pareto']))
+        start = time.monotonic()
+        counts = SyntheticData(
+            options['seed'], options['batch_size'],
+        ).generate(
+            users=options['users'],
+            titles=options['titles'],
+            reviews=options['reviews'],
+            comments=options['comments'],
+            max_genres=options['max_genres'],
+            zipf=options['zipf'],
+            pareto=options['pareto'],
+        )
+        self.stdout.write(self.style.SUCCESS(SUCCESS_MESSAGE.format(
+            seconds=time.monotonic() - start, **counts)))
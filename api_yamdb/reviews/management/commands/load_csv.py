@@ -1,12 +1,20 @@
 import csv
+import hashlib
+import io
 import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
 from ...models import (Category, Comment, Review,
-                       Genre, GenreTitle,
-                       Title, User)
+                       Genre, GenreTitle, ImportedFile, ImportedRow,
+                       Title, TOKEN_CLAIM_FIELDS, User)
+from ...ratings import recompute_ratings
 
 DATA = [
     (User, 'users.csv'),
@@ -17,36 +25,441 @@ DATA = [
     (Review, 'review.csv'),
     (Comment, 'comments.csv'),
 ]
+CHUNK_SIZE = 5000
+FILE_BLOCK_SIZE = 1024 * 1024
+# Сколько пачек на процесс разбирается впрок, пока идёт запись в БД.
+PREFETCH_PER_WORKER = 2
 
 ERROR_MESSAGE = ('Ошибка при загрузке данных'
                  'для модели "{model_name}": {error}')
 
 SUCCESS_MESSAGE = 'Данные для модели "{model_name}" успешно загружены'
 
+BULK_SUCCESS_MESSAGE = ('Данные для модели "{model_name}" загружены: '
+                        '{rows} строк за {seconds:.2f} с '
+                        '({rate:.0f} строк/с)')
+
+MISSING_RELATED_MESSAGE = ('Пропущено строк для модели "{model_name}" '
+                           'со ссылками на несуществующие объекты: {count}')
+
+RATINGS_MESSAGE = 'Рейтинг пересчитан для произведений: {count}'
+
+CYCLE_MESSAGE = 'Циклическая зависимость между моделями: {models}'
+
+UNCHANGED_MESSAGE = 'Файл "{filename}" не изменился, пропускаем'
+
+INCREMENTAL_MESSAGE = ('Данные для модели "{model_name}" обновлены: '
+                       'изменено строк {rows} за {seconds:.2f} с')
+
+
+def read_chunks(reader, chunk_size):
+    """Читать строки csv-файла пачками по chunk_size."""
+    while True:
+        chunk = list(islice(reader, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def find_chunks(path, chunk_size):
+    """Заголовок csv-файла и границы пачек по chunk_size записей.
+
+    Возвращает пару (заголовок, [(начало, конец), ...]) со смещениями в
+    байтах. Запись заканчивается переводом строки вне кавычек, поэтому
+    поля с переводами строк не разрываются между пачками.
+    """
+    header = None
+    chunks = []
+    offset = start = records = quotes = 0
+    with open(path, 'rb') as csv_file:
+        for line in csv_file:
+            offset += len(line)
+            quotes += line.count(b'"')
+            if quotes % 2:
+                continue
+            if header is None:
+                header = next(csv.reader([line.decode('utf-8')]))
+                start = offset
+                continue
+            records += 1
+            if records == chunk_size:
+                chunks.append((start, offset))
+                start, records = offset, 0
+    if records:
+        chunks.append((start, offset))
+    return header, chunks
+
+
+def parse_chunk(path, fieldnames, start, end):
+    """Разобрать одну пачку строк csv-файла.
+
+    Выполняется в отдельном процессе и не обращается к БД.
+    """
+    with open(path, 'rb') as csv_file:
+        csv_file.seek(start)
+        data = csv_file.read(end - start).decode('utf-8')
+    return list(csv.DictReader(
+        io.StringIO(data, newline=''), fieldnames=fieldnames))
+
+
+def parse_in_pool(executor, tasks, prefetch):
+    """Разбирать пачки в пуле процессов и отдавать их по порядку.
+
+    Впрок разбирается не больше prefetch пачек, поэтому в памяти
+    одновременно держится ограниченное число строк.
+    """
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(parse_chunk, *task))
+        if len(pending) >= prefetch:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def get_dependencies(data):
+    """Граф зависимостей моделей по внешним ключам."""
+    models = {model for model, _ in data}
+    return {
+        model: {
+            field.related_model for field in model._meta.fields
+            if field.many_to_one
+            and field.related_model in models
+            and field.related_model is not model
+        }
+        for model, _ in data
+    }
+
+
+def get_load_order(data):
+    """Модели в порядке, при котором зависимости загружаются раньше."""
+    dependencies = get_dependencies(data)
+    order = []
+    pending = [model for model, _ in data]
+    while pending:
+        ready = [
+            model for model in pending if dependencies[model] <= set(order)
+        ]
+        if not ready:
+            raise CommandError(CYCLE_MESSAGE.format(
+                models=', '.join(model.__name__ for model in pending)))
+        order += ready
+        pending = [model for model in pending if model not in ready]
+    return order
+
+
+def get_path(filename):
+    return os.path.join(settings.STATICFILES_DIRS[0], 'data', filename)
+
+
+def file_checksum(path):
+    checksum = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(FILE_BLOCK_SIZE), b''):
+            checksum.update(block)
+    return checksum.hexdigest()
+
+
+def row_checksum(data, fieldnames):
+    return hashlib.sha256('\x1f'.join(
+        data[column] or '' for column in fieldnames
+    ).encode()).hexdigest()
+
+
+def save_claim_changes(users, update_fields):
+    """Сохранить через save() пользователей со сменой роли или статуса.
+
+    save() увеличивает версию токенов, а сигналы сбрасывают кэши
+    пользователя. Возвращает остальных пользователей для bulk_update.
+    """
+    claims = [name for name in TOKEN_CLAIM_FIELDS if name in update_fields]
+    if not claims:
+        return users
+    current = User.objects.only('username', *claims).in_bulk(
+        [int(user.pk) for user in users])
+    rest = []
+    for user in users:
+        saved = current[int(user.pk)]
+        if all(
+            User._meta.get_field(name).to_python(getattr(user, name))
+            == getattr(saved, name)
+            for name in claims
+        ):
+            rest.append(user)
+            continue
+        for name in update_fields:
+            setattr(saved, name, getattr(user, name))
+        saved.save(update_fields=update_fields)
+    return rest
+
 
 class Command(BaseCommand):
     """Импорт данных из csv-файлов"""
 
     help = ('Чтобы запустить импорт данных из csv-файлов, '
-            'выполните команду "python manage.py load_csv".')
+            'выполните команду "python manage.py load_csv". '
+            'Для больших файлов используйте ключ --bulk, '
+            'для разбора файлов в нескольких процессах - --workers.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Загружать пачками через bulk_create.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество строк в одной пачке для режима --bulk.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help=('Количество процессов для разбора csv-файлов '
+                  'в режиме --bulk.'),
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help=('Пропускать неизменившиеся файлы и обновлять '
+                  'только изменившиеся строки.'),
+        )
 
     def handle(self, *args, **options):
-        for model, filename in DATA:
-            file = os.path.join(settings.STATICFILES_DIRS[0], 'data', filename)
-            with open(file, encoding='utf-8') as csv_file:
-                file_reader = csv.DictReader(csv_file)
-                for data in file_reader:
-                    try:
-                        if model == Title and 'category' in data:
-                            data['category'] = Category.objects.get(
-                                id=data.pop('category'))
-                        if model in (Review, Comment) and 'author' in data:
-                            data['author'] = User.objects.get(
-                                id=data.pop('author'))
-                        model.objects.get_or_create(**data)
-                    except ValueError as error:
-                        self.stdout.write(self.style.ERROR(
-                            ERROR_MESSAGE.format(model_name=model.__name__,
-                                                 error=error)))
-                self.stdout.write(self.style.SUCCESS(
-                    SUCCESS_MESSAGE.format(model_name=model.__name__)))
+        self.related_ids = {}
+        if options['incremental']:
+            changed = sum(
+                self.incremental_load(model, filename, options['chunk_size'])
+                for model, filename in DATA
+            )
+            if changed:
+                self.stdout.write(self.style.SUCCESS(RATINGS_MESSAGE.format(
+                    count=recompute_ratings(Title, Review))))
+            return
+        if options['bulk'] and options['workers'] > 1:
+            self.parallel_load(options['workers'], options['chunk_size'])
+        else:
+            for model, filename in DATA:
+                with open(get_path(filename), encoding='utf-8') as csv_file:
+                    file_reader = csv.DictReader(csv_file)
+                    if options['bulk']:
+                        self.bulk_load(
+                            model,
+                            file_reader.fieldnames,
+                            read_chunks(file_reader, options['chunk_size']),
+                        )
+                    else:
+                        self.load(model, file_reader)
+        if options['bulk']:
+            self.stdout.write(self.style.SUCCESS(RATINGS_MESSAGE.format(
+                count=recompute_ratings(Title, Review))))
+
+    def load(self, model, file_reader):
+        for data in file_reader:
+            try:
+                if model == Title and 'category' in data:
+                    data['category'] = Category.objects.get(
+                        id=data.pop('category'))
+                if model in (Review, Comment) and 'author' in data:
+                    data['author'] = User.objects.get(
+                        id=data.pop('author'))
+                model.objects.get_or_create(**data)
+            except ValueError as error:
+                self.stdout.write(self.style.ERROR(
+                    ERROR_MESSAGE.format(model_name=model.__name__,
+                                         error=error)))
+        self.stdout.write(self.style.SUCCESS(
+            SUCCESS_MESSAGE.format(model_name=model.__name__)))
+
+    def get_related_ids(self, model):
+        """Множество id объектов модели, загружается из БД один раз."""
+        if model not in self.related_ids:
+            self.related_ids[model] = set(
+                model.objects.values_list('pk', flat=True))
+        return self.related_ids[model]
+
+    @staticmethod
+    def resolve_related(data, relations):
+        """Проверить внешние ключи строки по кэшу id без запросов к БД."""
+        for field, ids in relations:
+            value = data[field.attname]
+            if not value and field.null:
+                data[field.attname] = None
+            elif not value or int(value) not in ids:
+                return False
+        return True
+
+    def parallel_load(self, workers, chunk_size):
+        """Разбирать файлы пачками в нескольких процессах.
+
+        Файлы записываются в порядке зависимостей между моделями, а их
+        пачки разбираются в пуле впрок, пока идёт запись предыдущих.
+        Запись идёт в одном процессе, поэтому в БД одновременно пишет
+        только один писатель.
+        """
+        paths = {model: get_path(filename) for model, filename in DATA}
+        files = [
+            (model, *find_chunks(paths[model], chunk_size))
+            for model in get_load_order(DATA)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = parse_in_pool(
+                executor,
+                (
+                    (paths[model], fieldnames, start, end)
+                    for model, fieldnames, ranges in files
+                    for start, end in ranges
+                ),
+                workers * PREFETCH_PER_WORKER,
+            )
+            for model, fieldnames, ranges in files:
+                self.bulk_load(
+                    model, fieldnames, islice(chunks, len(ranges)))
+
+    def get_relations(self, model, fieldnames):
+        fields = {
+            column: model._meta.get_field(column)
+            for column in fieldnames
+        }
+        relations = [
+            (field, self.get_related_ids(field.related_model))
+            for field in fields.values() if field.many_to_one
+        ]
+        return fields, relations
+
+    def build_objects(self, model, fields, relations, chunk):
+        """Создать объекты модели из строк; вернуть их и число пропусков."""
+        objects = []
+        missing = 0
+        for data in chunk:
+            data = {
+                fields[column].attname: value
+                for column, value in data.items()
+            }
+            if not self.resolve_related(data, relations):
+                missing += 1
+                continue
+            objects.append(model(**data))
+        return objects, missing
+
+    def report_missing(self, model, missing):
+        if missing:
+            self.stdout.write(self.style.WARNING(
+                MISSING_RELATED_MESSAGE.format(model_name=model.__name__,
+                                               count=missing)))
+
+    def bulk_load(self, model, fieldnames, chunks):
+        fields, relations = self.get_relations(model, fieldnames)
+        rows = missing = 0
+        start = time.monotonic()
+        for chunk in chunks:
+            objects, skipped = self.build_objects(
+                model, fields, relations, chunk)
+            missing += skipped
+            with transaction.atomic():
+                model.objects.bulk_create(objects, ignore_conflicts=True)
+            rows += len(objects)
+        seconds = time.monotonic() - start
+        rate = rows / seconds if seconds else 0
+        # Загруженные объекты ещё не попали в кэш id, перечитаем при нужде.
+        self.related_ids.pop(model, None)
+        self.report_missing(model, missing)
+        self.stdout.write(self.style.SUCCESS(
+            BULK_SUCCESS_MESSAGE.format(model_name=model.__name__,
+                                        rows=rows,
+                                        seconds=seconds,
+                                        rate=rate)))
+
+    @staticmethod
+    def upsert(model, fields, objects):
+        """Вставить новые объекты и обновить существующие пачками.
+
+        Пользователи со сменой роли или статуса обновляются по одному
+        через save_claim_changes, чтобы отозвать их токены.
+        """
+        existing = set(model.objects.filter(
+            pk__in=[obj.pk for obj in objects]
+        ).values_list('pk', flat=True))
+        model.objects.bulk_create(
+            [obj for obj in objects if int(obj.pk) not in existing],
+            ignore_conflicts=True,
+        )
+        update_fields = [
+            field.name for field in fields.values()
+            if not field.primary_key
+            and not getattr(field, 'auto_now_add', False)
+        ]
+        if update_fields:
+            updated = [obj for obj in objects if int(obj.pk) in existing]
+            if model is User:
+                updated = save_claim_changes(updated, update_fields)
+            model.objects.bulk_update(updated, update_fields)
+
+    def incremental_load(self, model, filename, chunk_size):
+        """Загрузить только изменившиеся строки файла.
+
+        Файл с прежней контрольной суммой пропускается целиком; сумма
+        не сохраняется, если строки пропущены из-за ссылок на
+        несуществующие объекты. Строки
+        сравниваются с контрольными суммами прошлой загрузки: новые
+        вставляются, изменённые обновляются. Возвращает число
+        изменённых строк.
+        """
+        path = get_path(filename)
+        checksum = file_checksum(path)
+        imported, _ = ImportedFile.objects.get_or_create(filename=filename)
+        if imported.checksum == checksum:
+            self.stdout.write(UNCHANGED_MESSAGE.format(filename=filename))
+            return 0
+        rows = missing = 0
+        start = time.monotonic()
+        with open(path, encoding='utf-8') as csv_file:
+            file_reader = csv.DictReader(csv_file)
+            fieldnames = file_reader.fieldnames
+            fields, relations = self.get_relations(model, fieldnames)
+            pk_column = next(
+                column for column, field in fields.items()
+                if field.primary_key
+            )
+            for chunk in read_chunks(file_reader, chunk_size):
+                checksums = {
+                    int(data[pk_column]): row_checksum(data, fieldnames)
+                    for data in chunk
+                }
+                known = dict(imported.rows.filter(
+                    row_id__in=checksums,
+                ).values_list('row_id', 'checksum'))
+                objects, skipped = self.build_objects(
+                    model, fields, relations,
+                    [data for data in chunk
+                     if known.get(int(data[pk_column]))
+                     != checksums[int(data[pk_column])]],
+                )
+                missing += skipped
+                row_ids = [int(obj.pk) for obj in objects]
+                with transaction.atomic():
+                    self.upsert(model, fields, objects)
+                    imported.rows.filter(row_id__in=row_ids).delete()
+                    ImportedRow.objects.bulk_create(
+                        ImportedRow(
+                            file=imported,
+                            row_id=row_id,
+                            checksum=checksums[row_id],
+                        )
+                        for row_id in row_ids
+                    )
+                rows += len(objects)
+        # Пропущенные строки загрузятся при следующем запуске, когда
+        # появятся объекты, на которые они ссылаются.
+        if not missing:
+            imported.checksum = checksum
+            imported.save(update_fields=('checksum', 'loaded'))
+        self.related_ids.pop(model, None)
+        self.report_missing(model, missing)
+        self.stdout.write(self.style.SUCCESS(
+            INCREMENTAL_MESSAGE.format(model_name=model.__name__,
+                                       rows=rows,
+                                       seconds=time.monotonic() - start)))
+        return rows
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from ...models import Review, Title
+from ...ratings import recompute_ratings
+
+SUCCESS_MESSAGE = 'Рейтинг пересчитан для произведений: {count}'
+
+
+class Command(BaseCommand):
+    """Пересчёт сохранённых рейтингов произведений по отзывам"""
+
+    help = ('Чтобы пересчитать рейтинги произведений, '
+            'выполните команду "python manage.py recompute_ratings".')
+
+    def handle(self, *args, **options):
+        count = recompute_ratings(Title, Review)
+        self.stdout.write(self.style.SUCCESS(
+            SUCCESS_MESSAGE.format(count=count)))
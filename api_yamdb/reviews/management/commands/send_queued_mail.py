@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...mail import get_mail_queue
+
+SUCCESS_MESSAGE = 'Отправлено писем: {sent}, ошибок: {failed}'
+NOT_DATABASE_QUEUE = 'Очередь {queue} не хранит письма, отправлять нечего'
+
+
+class Command(BaseCommand):
+    """Отправка писем из очереди исходящей почты"""
+
+    help = ('Чтобы отправить письма из очереди, '
+            'выполните команду "python manage.py send_queued_mail". '
+            'С ключом --loop команда работает постоянно.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Количество писем, отправляемых за одну транзакцию.',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            help='Сколько раз пытаться отправить письмо.',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Разбирать очередь постоянно.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между проходами в режиме --loop, секунды.',
+        )
+
+    def handle(self, *args, **options):
+        queue = get_mail_queue()
+        if not hasattr(queue, 'drain'):
+            self.stdout.write(self.style.WARNING(
+                NOT_DATABASE_QUEUE.format(queue=type(queue).__name__)))
+            return
+        while True:
+            sent, failed = queue.drain(
+                batch_size=options['batch_size'],
+                max_attempts=options['max_attempts'],
+            )
+            if sent or failed or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    SUCCESS_MESSAGE.format(sent=sent, failed=failed)))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
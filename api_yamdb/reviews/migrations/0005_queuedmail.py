@@ -0,0 +1,32 @@
+# Generated by Django 3.2 on 2026-10-18 18:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_rating'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedMail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255, verbose_name='тема')),
+                ('body', models.TextField(verbose_name='текст')),
+                ('from_email', models.EmailField(max_length=254, verbose_name='отправитель')),
+                ('to', models.EmailField(max_length=254, verbose_name='получатель')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='дата постановки в очередь')),
+                ('sent', models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='дата отправки')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='попытки отправки')),
+                ('last_error', models.TextField(blank=True, verbose_name='последняя ошибка')),
+            ],
+            options={
+                'verbose_name': 'исходящее письмо',
+                'verbose_name_plural': 'исходящие письма',
+                'ordering': ('id',),
+            },
+        ),
+    ]
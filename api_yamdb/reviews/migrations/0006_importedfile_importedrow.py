@@ -0,0 +1,45 @@
+# Generated by Django 3.2 on 2026-10-18 18:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_queuedmail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportedFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('filename', models.CharField(max_length=255, unique=True, verbose_name='имя файла')),
+                ('checksum', models.CharField(max_length=64, verbose_name='контрольная сумма')),
+                ('loaded', models.DateTimeField(auto_now=True, verbose_name='дата загрузки')),
+            ],
+            options={
+                'verbose_name': 'загруженный файл',
+                'verbose_name_plural': 'загруженные файлы',
+                'ordering': ('filename',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ImportedRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row_id', models.BigIntegerField(verbose_name='id строки')),
+                ('checksum', models.CharField(max_length=64, verbose_name='контрольная сумма')),
+                ('file', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rows', to='reviews.importedfile', verbose_name='файл')),
+            ],
+            options={
+                'verbose_name': 'загруженная строка',
+                'verbose_name_plural': 'загруженные строки',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importedrow',
+            constraint=models.UniqueConstraint(fields=('file', 'row_id'), name='unique_imported_row'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 3.2 on 2026-10-18 19:02
+
+from django.db import migrations
+
+# SQL повторяет reviews.search на момент миграции, чтобы изменения
+# модуля не ломали применение миграций к новой БД.
+FTS_TABLE = 'reviews_title_fts'
+POSTGRES_INDEX = 'reviews_title_search'
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('russian', name), 'A') || "
+    "setweight(to_tsvector('russian', description), 'B')"
+)
+INSTALL = {
+    'sqlite': (
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+        "name, description, content='reviews_title', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON reviews_title "
+        f"BEGIN INSERT INTO {FTS_TABLE}(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END",
+        f"CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON reviews_title "
+        f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, "
+        "description) VALUES ('delete', old.id, old.name, old.description); "
+        "END",
+        f"CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE OF name, "
+        "description ON reviews_title BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); "
+        f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END",
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+    ),
+    'postgresql': (
+        f'CREATE INDEX {POSTGRES_INDEX} ON reviews_title '
+        f'USING GIN (({POSTGRES_VECTOR}))',
+    ),
+}
+UNINSTALL = {
+    'sqlite': (
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert',
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_delete',
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_update',
+        f'DROP TABLE IF EXISTS {FTS_TABLE}',
+    ),
+    'postgresql': (
+        f'DROP INDEX IF EXISTS {POSTGRES_INDEX}',
+    ),
+}
+
+
+def install_search(apps, schema_editor):
+    for sql in INSTALL.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(sql)
+
+
+def uninstall_search(apps, schema_editor):
+    for sql in UNINSTALL.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_version_modified'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, uninstall_search),
+    ]
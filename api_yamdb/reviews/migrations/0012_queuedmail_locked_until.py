@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 19:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_confirmation_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='queuedmail',
+            name='locked_until',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='занято отправкой до'),
+        ),
+    ]
@@ -1,8 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 
-from api_yamdb.settings import CODE_DEFAULT, CODE_LENGTH
+from .ratings import average
 from .validators import validate_year, validate_username
 
 # User
@@ -45,6 +45,32 @@ REVIEW_COMMENT_INFO = (
     'Автор: {author:.15}, '
     'Дата публикации: {pub_date}.'
 )
+# Title
+COUNTER_FIELDS = ('rating_sum', 'rating_count', 'version')
+# QueuedMail
+SUBJECT_LENGTH = 255
+QUEUED_MAIL_INFO = (
+    'Тема: {subject:.15}, '
+    'Получатель: {to}, '
+    'Отправлено: {sent}.'
+)
+# ConfirmationCode
+CODE_HASH_LENGTH = 64
+CONFIRMATION_CODE_INFO = (
+    'Пользователь: {user_id}, '
+    'Действует до: {expires}.'
+)
+# ImportedFile, ImportedRow
+FILENAME_LENGTH = 255
+CHECKSUM_LENGTH = 64
+IMPORTED_FILE_INFO = (
+    'Файл: {filename}, '
+    'Загружен: {loaded}.'
+)
+IMPORTED_ROW_INFO = (
+    'Файл: {filename}, '
+    'id строки: {row_id}.'
+)
 # Roles
 USER = 'user'
 MODERATOR = 'moderator'
@@ -54,6 +80,8 @@ ROLES = (
     (MODERATOR, 'Модератор'),
     (ADMIN, 'Администратор'),
 )
+# Поля пользователя, при изменении которых отзываются его токены.
+TOKEN_CLAIM_FIELDS = ('role', 'is_staff', 'is_active')
 
 
 class User(AbstractUser):
@@ -94,9 +122,11 @@ class User(AbstractUser):
         max_length=max(len(role) for role, _ in ROLES),
         blank=True,
     )
-    confirmation_code = models.CharField(
-        max_length=CODE_LENGTH,
-        default=CODE_DEFAULT,
+    token_version = models.PositiveIntegerField(
+        'версия токенов',
+        default=0,
+        editable=False,
+        help_text='Токены с другой версией недействительны',
     )
 
     @property
@@ -116,6 +146,39 @@ class User(AbstractUser):
         verbose_name = 'пользователь'
         verbose_name_plural = 'пользователи'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._loaded_claims = {
+            name: loaded[name] for name in TOKEN_CLAIM_FIELDS
+            if name in loaded
+        }
+        instance._loaded_username = loaded.get('username')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Токены хранят роль, поэтому её смена отзывает выданные токены.
+        loaded = getattr(self, '_loaded_claims', {})
+        if any(getattr(self, name) != value for name, value in loaded.items()):
+            self.token_version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = [
+                    *kwargs['update_fields'], 'token_version',
+                ]
+        super().save(*args, **kwargs)
+        # Отложенные поля (only, defer) не попадают в __dict__.
+        self._loaded_claims = {
+            name: self.__dict__[name] for name in TOKEN_CLAIM_FIELDS
+            if name in self.__dict__
+        }
+        self._loaded_username = self.__dict__.get('username')
+
+    def revoke_tokens(self):
+        """Отозвать все выданные пользователю токены."""
+        self.token_version += 1
+        self.save(update_fields=('token_version',))
+
     def __str__(self):
         return USER_INFO.format(
             username=self.username,
@@ -201,11 +264,56 @@ class Title(models.Model):
         db_index=True,
         help_text='Укажите год создания произведения',
     )
+    rating_sum = models.PositiveIntegerField(
+        'сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        'количество оценок',
+        default=0,
+        editable=False,
+    )
+    version = models.PositiveIntegerField(
+        'версия',
+        default=0,
+        editable=False,
+        help_text='Растёт при любом изменении произведения и его отзывов',
+    )
+    modified = models.DateTimeField(
+        'дата изменения',
+        auto_now=True,
+    )
 
     class Meta:
         ordering = ('name',)
         verbose_name = 'произведение'
         verbose_name_plural = 'произведения'
+        indexes = [
+            models.Index(
+                fields=('name', 'id'),
+                name='title_name_id_idx',
+            ),
+            models.Index(
+                fields=('category', 'name'),
+                name='title_category_name_idx',
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Счётчики меняются атомарными UPDATE, сохранение объекта,
+        # загруженного раньше, не должно их перезаписывать.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def rating(self):
+        """Средняя оценка, целая часть; None, если отзывов нет."""
+        return average(self.rating_sum, self.rating_count)
 
     def __str__(self):
         return TITLE_INFO.format(
@@ -236,6 +344,12 @@ class GenreTitle(models.Model):
     class Meta:
         verbose_name = 'жанр произведения'
         verbose_name_plural = 'жанры произведений'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('genre', 'title',),
+                name='unique_genre_title',
+            ),
+        ]
 
     def __str__(self):
         return GENRE_TITLE_INFO.format(
@@ -297,6 +411,23 @@ class Review(TextAuthorDate):
                 name='unique_review',
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx',
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = dict(zip(field_names, values)).get('score')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Рейтинг произведения обновляется в post_save в той же транзакции.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
 
 
 class Comment(TextAuthorDate):
@@ -311,3 +442,157 @@ class Comment(TextAuthorDate):
     class Meta(TextAuthorDate.Meta):
         verbose_name = 'комментарий'
         verbose_name_plural = 'комментарии'
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx',
+            ),
+        ]
+
+
+class QueuedMail(models.Model):
+    """Исходящие письма, ожидающие отправки."""
+
+    subject = models.CharField(
+        'тема',
+        max_length=SUBJECT_LENGTH,
+    )
+    body = models.TextField(
+        'текст',
+    )
+    from_email = models.EmailField(
+        'отправитель',
+        max_length=EMAIL_LENGTH,
+    )
+    to = models.EmailField(
+        'получатель',
+        max_length=EMAIL_LENGTH,
+    )
+    created = models.DateTimeField(
+        'дата постановки в очередь',
+        auto_now_add=True,
+    )
+    sent = models.DateTimeField(
+        'дата отправки',
+        null=True,
+        blank=True,
+        db_index=True,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'попытки отправки',
+        default=0,
+    )
+    locked_until = models.DateTimeField(
+        'занято отправкой до',
+        null=True,
+        blank=True,
+    )
+    last_error = models.TextField(
+        'последняя ошибка',
+        blank=True,
+    )
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'исходящие письма'
+
+    def __str__(self):
+        return QUEUED_MAIL_INFO.format(
+            subject=self.subject,
+            to=self.to,
+            sent=self.sent,
+        )
+
+
+class ConfirmationCode(models.Model):
+    """Действующие коды подтверждения, хранятся в виде хэша."""
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='confirmation_code',
+        verbose_name='пользователь',
+    )
+    code_hash = models.CharField(
+        'хэш кода',
+        max_length=CODE_HASH_LENGTH,
+    )
+    expires = models.DateTimeField(
+        'действует до',
+        db_index=True,
+    )
+
+    class Meta:
+        verbose_name = 'код подтверждения'
+        verbose_name_plural = 'коды подтверждения'
+
+    def __str__(self):
+        return CONFIRMATION_CODE_INFO.format(
+            user_id=self.user_id,
+            expires=self.expires,
+        )
+
+
+class ImportedFile(models.Model):
+    """Загруженные командой load_csv файлы."""
+
+    filename = models.CharField(
+        'имя файла',
+        max_length=FILENAME_LENGTH,
+        unique=True,
+    )
+    checksum = models.CharField(
+        'контрольная сумма',
+        max_length=CHECKSUM_LENGTH,
+    )
+    loaded = models.DateTimeField(
+        'дата загрузки',
+        auto_now=True,
+    )
+
+    class Meta:
+        ordering = ('filename',)
+        verbose_name = 'загруженный файл'
+        verbose_name_plural = 'загруженные файлы'
+
+    def __str__(self):
+        return IMPORTED_FILE_INFO.format(
+            filename=self.filename,
+            loaded=self.loaded,
+        )
+
+
+class ImportedRow(models.Model):
+    """Контрольные суммы загруженных строк csv-файлов."""
+
+    file = models.ForeignKey(
+        ImportedFile,
+        verbose_name='файл',
+        on_delete=models.CASCADE,
+        related_name='rows',
+    )
+    row_id = models.BigIntegerField(
+        'id строки',
+    )
+    checksum = models.CharField(
+        'контрольная сумма',
+        max_length=CHECKSUM_LENGTH,
+    )
+
+    class Meta:
+        verbose_name = 'загруженная строка'
+        verbose_name_plural = 'загруженные строки'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('file', 'row_id',),
+                name='unique_imported_row',
+            ),
+        ]
+
+    def __str__(self):
+        return IMPORTED_ROW_INFO.format(
+            filename=self.file.filename,
+            row_id=self.row_id,
+        )
@@ -0,0 +1,80 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Now
+
+TITLES_LIST_VERSION_KEY = 'reviews:titles:list_version'
+
+
+def average(rating_sum, rating_count):
+    """Средняя оценка, целая часть; None, если отзывов нет."""
+    if not rating_count:
+        return None
+    return rating_sum // rating_count
+
+
+def get_titles_list_version():
+    """Версия списка произведений: время последнего изменения в нс.
+
+    Хранится в кэше LIST_CACHE_ALIAS; чтобы её видели все процессы,
+    кэш должен быть общим.
+    """
+    return caches[settings.LIST_CACHE_ALIAS].get_or_set(
+        TITLES_LIST_VERSION_KEY, time.time_ns, None)
+
+
+def touch_titles_list():
+    """Сменить версию списка произведений после фиксации транзакции."""
+    transaction.on_commit(lambda: caches[settings.LIST_CACHE_ALIAS].set(
+        TITLES_LIST_VERSION_KEY, time.time_ns(), None))
+
+
+def touch_titles(titles, listed=True):
+    """Увеличить версию произведений и обновить дату изменения.
+
+    listed=False - изменение не видно в списке произведений
+    (комментарии, имена авторов), его версия не меняется.
+    """
+    if listed:
+        touch_titles_list()
+    return titles.update(version=F('version') + 1, modified=Now())
+
+
+def change_rating(title_model, title_id, score_delta, count_delta):
+    """Атомарно изменить сохранённые сумму и количество оценок."""
+    touch_titles_list()
+    title_model.objects.filter(id=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+        version=F('version') + 1,
+        modified=Now(),
+    )
+
+
+def recompute_ratings(title_model, review_model):
+    """Пересчитать сумму и количество оценок всех произведений.
+
+    Выполняется одним UPDATE с подзапросами по отзывам. Версия
+    произведений тоже увеличивается: пересчёт запускают после массовой
+    загрузки, которая не вызывает сигналы. Возвращает количество
+    обновлённых произведений.
+    """
+    reviews = review_model.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    touch_titles_list()
+    return title_model.objects.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0,
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('id')).values('total')),
+            0,
+        ),
+        version=F('version') + 1,
+        modified=Now(),
+    )
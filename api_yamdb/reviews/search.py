@@ -0,0 +1,94 @@
+import re
+
+from django.conf import settings
+from django.db import connection as default_connection
+from django.db.models import Q, Value
+from django.utils.module_loading import import_string
+
+WORD = re.compile(r'\w+')
+SEARCH_RANK = 'search_rank'
+
+
+def get_words(query):
+    return WORD.findall(query.lower())
+
+
+class SimpleSearchBackend:
+    """Поиск через LIKE для БД без полнотекстового индекса."""
+
+    def search(self, queryset, query):
+        condition = Q()
+        for word in get_words(query):
+            condition &= (
+                Q(name__icontains=word) | Q(description__icontains=word)
+            )
+        return queryset.filter(condition).annotate(
+            **{SEARCH_RANK: Value(0)})
+
+
+class SQLiteSearchBackend:
+    """Индекс FTS5 по названию и описанию произведений.
+
+    Таблица индекса хранит ссылки на строки reviews_title и обновляется
+    триггерами, поэтому остаётся актуальной и при массовых вставках.
+    Таблицу и триггеры создаёт миграция 0008_title_search.
+    Чем меньше search_rank (bm25), тем выше релевантность; совпадение
+    в названии весит больше, чем в описании.
+    """
+
+    TABLE = 'reviews_title_fts'
+    NAME_WEIGHT = 10.0
+    DESCRIPTION_WEIGHT = 1.0
+
+    def search(self, queryset, query):
+        words = get_words(query)
+        if not words:
+            return queryset.none().annotate(**{SEARCH_RANK: Value(0)})
+        # Слова в кавычках не разбираются как синтаксис FTS5,
+        # звёздочка включает поиск по началу слова.
+        match = ' '.join(f'"{word}"*' for word in words)
+        return queryset.extra(
+            tables=[self.TABLE],
+            where=[
+                f'{self.TABLE}.rowid = reviews_title.id',
+                f'{self.TABLE} MATCH %s',
+            ],
+            params=[match],
+            select={SEARCH_RANK: (
+                f'bm25({self.TABLE}, '
+                f'{self.NAME_WEIGHT}, {self.DESCRIPTION_WEIGHT})'
+            )},
+        )
+
+
+class PostgresSearchBackend:
+    """Поиск по tsvector с GIN-индексом по выражению.
+
+    Индекс (миграция 0008_title_search) строится по тому же выражению,
+    что и запрос, поэтому отдельная колонка и её синхронизация не нужны.
+    """
+
+    CONFIG = 'russian'
+    VECTOR = (
+        "setweight(to_tsvector('{config}', {table}name), 'A') || "
+        "setweight(to_tsvector('{config}', {table}description), 'B')"
+    )
+
+    def get_vector(self, table=''):
+        return self.VECTOR.format(config=self.CONFIG, table=table)
+
+    def search(self, queryset, query):
+        vector = self.get_vector('reviews_title.')
+        tsquery = f"websearch_to_tsquery('{self.CONFIG}', %s)"
+        return queryset.extra(
+            where=[f'({vector}) @@ {tsquery}'],
+            params=[query],
+            select={SEARCH_RANK: f'-ts_rank({vector}, {tsquery})'},
+            select_params=[query],
+        )
+
+
+def get_search_backend(connection=default_connection):
+    """Бэкенд поиска произведений для СУБД соединения."""
+    return import_string(settings.TITLE_SEARCH_BACKENDS.get(
+        connection.vendor, settings.TITLE_SEARCH_DEFAULT_BACKEND))()
@@ -0,0 +1,95 @@
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete,
+)
+from django.dispatch import receiver
+
+from .models import Category, Comment, Genre, Review, Title, User
+from .ratings import change_rating, touch_titles, touch_titles_list
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    """Учесть новый отзыв или изменённую оценку в рейтинге произведения."""
+    if raw:
+        return
+    if created:
+        change_rating(Title, instance.title_id, instance.score, 1)
+    else:
+        loaded_score = getattr(instance, '_loaded_score', None)
+        score_delta = 0
+        if loaded_score is not None:
+            score_delta = instance.score - loaded_score
+        change_rating(Title, instance.title_id, score_delta, 0)
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Исключить оценку удалённого отзыва из рейтинга произведения."""
+    change_rating(Title, instance.title_id, -instance.score, -1)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_titles(
+            Title.objects.filter(reviews=instance.review_id), listed=False)
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_titles(Title.objects.filter(id=instance.id))
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, **kwargs):
+    touch_titles_list()
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if reverse and action == 'pre_clear':
+        touch_titles(Title.objects.filter(genre=instance))
+    elif not action.startswith('post_'):
+        return
+    elif not reverse:
+        touch_titles(Title.objects.filter(id=instance.id))
+    elif pk_set:
+        touch_titles(Title.objects.filter(id__in=pk_set))
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def category_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_titles(Title.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def genre_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_titles(Title.objects.filter(genre=instance))
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, update_fields=None,
+               **kwargs):
+    """Имя автора выводится в отзывах и комментариях.
+
+    Сигнал срабатывает до того, как save() запомнит новое имя, поэтому
+    _loaded_username ещё хранит прежнее.
+    """
+    if raw or created:
+        return
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    if getattr(instance, '_loaded_username', None) == instance.username:
+        return
+    touch_titles(Title.objects.filter(
+        Q(reviews__author=instance) | Q(reviews__comments__author=instance)
+    ), listed=False)
@@ -0,0 +1,15 @@
+import pytest
+from api.authentication import user_cache
+from api.autocomplete import autocomplete_index
+from api.ratelimit import get_rate_limit_backend
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+    # После очистки БД id пользователей используются повторно.
+    user_cache.clear()
+    get_rate_limit_backend().clear()
+    autocomplete_index.clear()
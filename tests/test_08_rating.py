@@ -0,0 +1,74 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from reviews.models import Title
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08Rating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_reviews(self, admin_client, admin, user,
+                                       user_client, moderator,
+                                       moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/{{review_id}}/'
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения учитывает новые отзывы.'
+        )
+
+        response = admin_client.patch(
+            url.format(review_id=reviews[0]['id']), data={'score': 8}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при изменении оценки отзыва.'
+        )
+
+        response = admin_client.delete(
+            url.format(review_id=reviews[1]['id'])
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при удалении отзыва.'
+        )
+
+        user.delete()
+        moderator.delete()
+        assert self.get_rating(admin_client, title_id) == 8, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при каскадном удалении отзывов.'
+        )
+
+    def test_02_recompute_ratings(self, admin_client, admin, user,
+                                  user_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+        }
+        _, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(rating_sum=0, rating_count=0)
+        assert self.get_rating(admin_client, titles[0]['id']) is None
+
+        call_command('recompute_ratings', stdout=StringIO())
+        assert self.get_rating(admin_client, titles[0]['id']) == 5, (
+            'Проверьте, что команда `recompute_ratings` восстанавливает '
+            'рейтинг произведений по отзывам.'
+        )
+        assert self.get_rating(admin_client, titles[1]['id']) is None
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Category, Genre, Review, Title
+
+
+def create_titles_orm(count):
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(3)
+    ]
+    for idx in range(count):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09Queries:
+
+    def test_01_title_list_queries(self, client):
+        create_titles_orm(1)
+        one_title_queries = count_queries(client, '/api/v1/titles/')
+        Title.objects.all().delete()
+        Category.objects.all().delete()
+        Genre.objects.all().delete()
+        create_titles_orm(5)
+        page_queries = count_queries(client, '/api/v1/titles/')
+        # Версия списка для ETag, количество, страница и жанры.
+        assert page_queries == one_title_queries <= 4, (
+            'Проверьте, что количество запросов к БД при GET-запросе к '
+            '`/api/v1/titles/` не зависит от количества произведений на '
+            'странице: категории и жанры должны загружаться заранее.'
+        )
+
+    def test_02_title_detail_queries(self, client):
+        create_titles_orm(1)
+        title = Title.objects.get()
+        # Версия для ETag, произведение с категорией и жанры.
+        assert count_queries(client, f'/api/v1/titles/{title.id}/') <= 3, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{title_id}/` '
+            'загружает категорию и жанры произведения без лишних запросов.'
+        )
+
+    def test_03_review_create_queries(self, user_client, user):
+        create_titles_orm(1)
+        title = Title.objects.get()
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        # Пользователь из токена, произведение, а в транзакции - вставка
+        # отзыва и обновление рейтинга произведения.
+        assert len(context.captured_queries) <= 5, (
+            'Проверьте, что POST-запрос к `/api/v1/titles/{title_id}/reviews/` '
+            'загружает произведение один раз, а повторный отзыв отсекается '
+            'ограничением уникальности при вставке.'
+        )
+
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв на произведение возвращает '
+            'ответ со статусом 400.'
+        )
+        assert title.reviews.count() == 1
+
+    def test_04_review_integrity_error(self, user_client, monkeypatch):
+        create_titles_orm(1)
+        title = Title.objects.get()
+
+        def fail(*args, **kwargs):
+            raise IntegrityError('NOT NULL constraint failed')
+
+        monkeypatch.setattr(Review, 'save', fail)
+        user_client.raise_request_exception = False
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 7},
+        )
+        assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR, (
+            'Проверьте, что ошибка целостности, не связанная с повторным '
+            'отзывом, не выдаётся за повторный отзыв.'
+        )
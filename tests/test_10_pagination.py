@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Review, Title
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    def walk_pages(self, client, url):
+        results = []
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert not any(
+                'COUNT(' in query['sql'].upper()
+                for query in context.captured_queries
+            ), (
+                'Проверьте, что в режиме курсора не выполняется '
+                'запрос количества объектов.'
+            )
+            data = response.json()
+            assert 'count' not in data
+            results.extend(data['results'])
+            url = data['next']
+        return results
+
+    def test_01_reviews_cursor(self, admin_client, django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        title = Title.objects.get(id=titles[0]['id'])
+        for idx in range(12):
+            author = django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text=f'review {idx}', score=5
+            )
+        url = f'/api/v1/titles/{title.id}/reviews/'
+
+        results = self.walk_pages(admin_client, url + '?pagination=cursor')
+        assert [review['id'] for review in results] == list(
+            title.reviews.order_by('-pub_date', '-id').values_list(
+                'id', flat=True)
+        ), (
+            'Проверьте, что в режиме курсора `/api/v1/titles/{title_id}/reviews/` '
+            'возвращает все отзывы '
+            'в порядке убывания даты публикации без повторов.'
+        )
+
+        response = admin_client.get(url)
+        assert response.json()['count'] == 12, (
+            'Проверьте, что без параметра `pagination=cursor` сохраняется '
+            'постраничная пагинация.'
+        )
+
+    def test_02_titles_cursor(self, admin_client):
+        create_titles(admin_client)
+        results = self.walk_pages(
+            admin_client, '/api/v1/titles/?pagination=cursor'
+        )
+        assert [title['name'] for title in results] == sorted(
+            title['name'] for title in results
+        )
+        assert len(results) == 2
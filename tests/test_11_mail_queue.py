@@ -0,0 +1,89 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from reviews.mail import DatabaseMailQueue
+from reviews.models import QueuedMail
+
+
+class FakeConnection:
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.states = []
+
+    def send_messages(self, messages):
+        self.states.append((
+            connection.in_atomic_block,
+            QueuedMail.objects.filter(locked_until__isnull=False).count(),
+        ))
+        if self.fail:
+            raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11MailQueue:
+    url_signup = '/api/v1/auth/signup/'
+
+    def signup(self, client, idx):
+        response = client.post(self.url_signup, data={
+            'email': f'queued{idx}@yamdb.fake',
+            'username': f'queued{idx}',
+        })
+        assert response.status_code == HTTPStatus.OK
+
+    def test_01_signup_queues_mail(self, client):
+        outbox_before_count = len(mail.outbox)
+        self.signup(client, 0)
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST-запрос к `{self.url_signup}` не отправляет '
+            'письмо в рамках запроса, а ставит его в очередь.'
+        )
+        queued = QueuedMail.objects.get()
+        assert queued.to == 'queued0@yamdb.fake'
+        assert queued.sent is None
+
+    def test_02_send_queued_mail_in_batches(self, client):
+        for idx in range(5):
+            self.signup(client, idx)
+        outbox_before_count = len(mail.outbox)
+        call_command('send_queued_mail', batch_size=2, stdout=StringIO())
+        assert len(mail.outbox) == outbox_before_count + 5, (
+            'Проверьте, что команда `send_queued_mail` отправляет все письма '
+            'из очереди.'
+        )
+        assert not QueuedMail.objects.filter(sent__isnull=True).exists()
+
+        call_command('send_queued_mail', stdout=StringIO())
+        assert len(mail.outbox) == outbox_before_count + 5, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_03_send_outside_transaction(self, client):
+        for idx in range(2):
+            self.signup(client, idx)
+        fake = FakeConnection()
+        assert DatabaseMailQueue().send_batch(fake, 10, 5) == (
+            2, 0, QueuedMail.objects.last().id)
+        assert fake.states == [(False, 2), (False, 1)], (
+            'Проверьте, что письма занимаются до отправки, а отправка '
+            'идёт вне транзакции.'
+        )
+        assert not QueuedMail.objects.filter(
+            locked_until__isnull=False).exists()
+
+    def test_04_failed_send_released(self, client):
+        self.signup(client, 0)
+        queue = DatabaseMailQueue()
+        assert queue.send_batch(FakeConnection(fail=True), 10, 5)[:2] == (
+            0, 1)
+        queued = QueuedMail.objects.get()
+        assert queued.sent is None
+        assert queued.attempts == 1
+        assert queued.last_error == 'SMTP недоступен'
+        assert queue.send_batch(FakeConnection(), 10, 5)[:2] == (1, 0), (
+            'Проверьте, что неотправленное письмо снова берётся в работу.'
+        )
@@ -0,0 +1,201 @@
+import os
+import shutil
+from io import StringIO
+
+import pytest
+from api.authentication import get_token_version
+from django.core.management import call_command
+from django.db.models import Avg
+from reviews.management.commands.load_csv import (DATA, find_chunks,
+                                                  get_dependencies,
+                                                  get_load_order, parse_chunk)
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+
+MODELS = (User, Category, Genre, Title, GenreTitle, Review, Comment)
+
+
+def model_counts():
+    return [model.objects.count() for model in MODELS]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12LoadCsv:
+
+    def test_01_bulk_matches_default_mode(self):
+        call_command('load_csv', stdout=StringIO())
+        expected_counts = model_counts()
+        for model in reversed(MODELS):
+            model.objects.all().delete()
+
+        call_command('load_csv', bulk=True, chunk_size=7, stdout=StringIO())
+        assert model_counts() == expected_counts, (
+            'Проверьте, что `load_csv --bulk` загружает те же данные, '
+            'что и обычный режим.'
+        )
+        for title in Title.objects.annotate(average=Avg('reviews__score')):
+            expected = int(title.average) if title.average else None
+            assert title.rating == expected, (
+                'Проверьте, что после `load_csv --bulk` рейтинг '
+                'произведений пересчитан.'
+            )
+
+        call_command('load_csv', bulk=True, stdout=StringIO())
+        assert model_counts() == expected_counts, (
+            'Проверьте, что повторный запуск `load_csv --bulk` '
+            'не дублирует данные.'
+        )
+
+    def test_02_parallel_matches_default_mode(self):
+        call_command('load_csv', stdout=StringIO())
+        expected_counts = model_counts()
+        for model in reversed(MODELS):
+            model.objects.all().delete()
+
+        call_command(
+            'load_csv', bulk=True, workers=3, chunk_size=7, stdout=StringIO()
+        )
+        assert model_counts() == expected_counts, (
+            'Проверьте, что `load_csv --bulk --workers` загружает те же '
+            'данные, что и обычный режим.'
+        )
+
+    def test_03_dependency_graph(self):
+        dependencies = get_dependencies(DATA)
+        assert dependencies[User] == set()
+        assert dependencies[Category] == set()
+        assert dependencies[Genre] == set()
+        assert dependencies[Title] == {Category}
+        assert dependencies[GenreTitle] == {Genre, Title}
+        assert dependencies[Review] == {Title, User}
+        assert dependencies[Comment] == {Review, User}
+
+    def test_04_incremental_upsert(self, settings, tmp_path):
+        data_dir = tmp_path / 'data'
+        shutil.copytree(
+            os.path.join(settings.STATICFILES_DIRS[0], 'data'), data_dir
+        )
+        settings.STATICFILES_DIRS = (tmp_path,)
+        call_command('load_csv', incremental=True, stdout=StringIO())
+        expected_counts = model_counts()
+
+        output = StringIO()
+        call_command('load_csv', incremental=True, stdout=output)
+        assert output.getvalue().count('не изменился') == len(MODELS), (
+            'Проверьте, что `load_csv --incremental` пропускает '
+            'неизменившиеся файлы.'
+        )
+
+        categories = data_dir / 'category.csv'
+        content = categories.read_text(encoding='utf-8')
+        categories.write_text(
+            content.rstrip().replace('1,Фильм,movie', '1,Кино,movie')
+            + '\n4,Сериал,series\n',
+            encoding='utf-8',
+        )
+        output = StringIO()
+        call_command('load_csv', incremental=True, stdout=output)
+        assert 'изменено строк 2' in output.getvalue(), (
+            'Проверьте, что `load_csv --incremental` загружает только '
+            'изменившиеся строки.'
+        )
+        assert Category.objects.get(id=1).name == 'Кино'
+        assert Category.objects.get(id=4).slug == 'series'
+        assert model_counts()[1] == expected_counts[1] + 1
+
+    def test_05_load_order(self):
+        order = get_load_order(DATA)
+        assert all(
+            order.index(dependency) < order.index(model)
+            for model, dependencies in get_dependencies(DATA).items()
+            for dependency in dependencies
+        ), (
+            'Проверьте, что модели загружаются после своих зависимостей.'
+        )
+
+    def test_06_streamed_chunks(self, tmp_path):
+        path = tmp_path / 'comments.csv'
+        path.write_text(
+            'id,text\n1,"первая\nстрока"\n2,вторая\n3,"с ""кавычками"""\n',
+            encoding='utf-8',
+        )
+        fieldnames, ranges = find_chunks(path, 2)
+        assert fieldnames == ['id', 'text']
+        assert len(ranges) == 2
+        rows = [
+            row for start, end in ranges
+            for row in parse_chunk(path, fieldnames, start, end)
+        ]
+        assert [row['text'] for row in rows] == [
+            'первая\nстрока', 'вторая', 'с "кавычками"',
+        ], (
+            'Проверьте, что пачки не разрывают поля с переводом строки.'
+        )
+
+    def test_07_incremental_retries_skipped_rows(self, settings, tmp_path):
+        data_dir = tmp_path / 'data'
+        shutil.copytree(
+            os.path.join(settings.STATICFILES_DIRS[0], 'data'), data_dir
+        )
+        settings.STATICFILES_DIRS = (tmp_path,)
+        titles = data_dir / 'titles.csv'
+        titles.write_text(
+            titles.read_text(encoding='utf-8').rstrip()
+            + '\n9999,Новое произведение,2020,99\n',
+            encoding='utf-8',
+        )
+        call_command('load_csv', incremental=True, stdout=StringIO())
+        assert not Title.objects.filter(id=9999).exists()
+
+        output = StringIO()
+        call_command('load_csv', incremental=True, stdout=output)
+        assert 'Файл "titles.csv" не изменился' not in output.getvalue(), (
+            'Проверьте, что файл с пропущенными строками не отмечается '
+            'как загруженный.'
+        )
+        categories = data_dir / 'category.csv'
+        categories.write_text(
+            categories.read_text(encoding='utf-8').rstrip()
+            + '\n99,Комиксы,comics\n',
+            encoding='utf-8',
+        )
+        call_command('load_csv', incremental=True, stdout=StringIO())
+        assert Title.objects.get(id=9999).category_id == 99, (
+            'Проверьте, что пропущенные строки загружаются, когда '
+            'появляются объекты, на которые они ссылаются.'
+        )
+        output = StringIO()
+        call_command('load_csv', incremental=True, stdout=output)
+        assert 'Файл "titles.csv" не изменился' in output.getvalue()
+
+    def test_08_incremental_role_change(self, settings, tmp_path):
+        data_dir = tmp_path / 'data'
+        shutil.copytree(
+            os.path.join(settings.STATICFILES_DIRS[0], 'data'), data_dir
+        )
+        settings.STATICFILES_DIRS = (tmp_path,)
+        call_command('load_csv', incremental=True, stdout=StringIO())
+        versions = dict(User.objects.values_list('id', 'token_version'))
+        assert get_token_version(101) == versions[101]
+        users = data_dir / 'users.csv'
+        users.write_text(
+            users.read_text(encoding='utf-8').replace(
+                '101,capt_obvious,capt_obvious@yamdb.fake,admin',
+                '101,capt_obvious,capt_obvious@yamdb.fake,user',
+            ).replace('100,bingobongo,', '100,bingo,'),
+            encoding='utf-8',
+        )
+        call_command('load_csv', incremental=True, stdout=StringIO())
+        demoted = User.objects.get(id=101)
+        assert demoted.role == 'user'
+        assert demoted.token_version == versions[101] + 1, (
+            'Проверьте, что смена роли при загрузке отзывает токены '
+            'пользователя.'
+        )
+        assert get_token_version(101) == versions[101] + 1, (
+            'Проверьте, что смена роли при загрузке сбрасывает кэш '
+            'версии токенов.'
+        )
+        renamed = User.objects.get(id=100)
+        assert renamed.username == 'bingo'
+        assert renamed.token_version == versions[100]
@@ -0,0 +1,54 @@
+from http import HTTPStatus
+
+import pytest
+from api.cache import list_cache_stats
+from reviews.models import Category
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ListCache:
+
+    @pytest.mark.parametrize('url', ('/api/v1/categories/', '/api/v1/genres/'))
+    def test_01_list_is_cached_and_invalidated(self, client, admin_client,
+                                               url):
+        data = {'name': 'Первый', 'slug': 'first'}
+        assert admin_client.post(url, data=data).status_code == (
+            HTTPStatus.CREATED
+        )
+        stats_before = list_cache_stats.snapshot()
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        response = client.get(url)
+        assert response['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос к `{url}` отдаётся из кэша.'
+        )
+        assert response.json()['count'] == 1
+        stats_after = list_cache_stats.snapshot()
+        assert stats_after['hits'] == stats_before['hits'] + 1
+        assert stats_after['misses'] == stats_before['misses'] + 1
+
+        response = client.get(url, {'search': 'Первый'})
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что ключ кэша учитывает параметры запроса.'
+        )
+
+        data = {'name': 'Второй', 'slug': 'second'}
+        admin_client.post(url, data=data)
+        response = client.get(url)
+        assert response.json()['count'] == 2, (
+            f'Проверьте, что кэш `{url}` сбрасывается при создании объекта.'
+        )
+        admin_client.delete(f'{url}second/')
+        response = client.get(url)
+        assert response.json()['count'] == 1, (
+            f'Проверьте, что кэш `{url}` сбрасывается при удалении объекта.'
+        )
+
+    def test_02_model_change_invalidates_cache(self, client):
+        category = Category.objects.create(name='Фильм', slug='films')
+        client.get('/api/v1/categories/')
+        category.name = 'Кино'
+        category.save()
+        response = client.get('/api/v1/categories/')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['name'] == 'Кино'
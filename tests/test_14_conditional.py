@@ -0,0 +1,137 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews import ratings
+from reviews.models import Category, Title
+
+from tests.utils import (create_comments, create_reviews,
+                         create_single_review)
+
+
+def assert_not_modified(client, url, response):
+    etag = response['ETag']
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        f'Проверьте, что GET-запрос к `{url}` с заголовком If-None-Match, '
+        'совпадающим с ETag, возвращает ответ со статусом 304.'
+    )
+    assert response['ETag'] == etag
+    return etag
+
+
+def assert_modified(client, url, etag):
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что после изменения данных GET-запрос к `{url}` '
+        'с прежним ETag возвращает ответ со статусом 200.'
+    )
+    assert response['ETag'] != etag
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ConditionalGet:
+
+    def test_01_reviews_and_comments(self, client, admin_client, admin,
+                                     user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_id = titles[0]['id']
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+
+        etag = assert_not_modified(
+            client, reviews_url, client.get(reviews_url))
+        response = admin_client.patch(
+            f'{reviews_url}{reviews[0]["id"]}/', data={'text': 'Новый текст'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert_modified(client, reviews_url, etag)
+
+        etag = assert_not_modified(
+            client, comments_url, client.get(comments_url))
+        response = user_client.patch(
+            f'{comments_url}{comments[1]["id"]}/', data={'text': 'Правка'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert_modified(client, comments_url, etag)
+
+        response = client.get(comments_url)
+        response = client.get(
+            comments_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что GET-запрос с заголовком If-Modified-Since '
+            'не раньше Last-Modified возвращает ответ со статусом 304.'
+        )
+
+    def test_02_titles(self, client, admin_client, admin, user_client, user):
+        author_map = {admin: admin_client}
+        _, titles = create_reviews(admin_client, author_map)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        list_url = '/api/v1/titles/'
+
+        title_etag = assert_not_modified(
+            client, title_url, client.get(title_url))
+        list_etag = assert_not_modified(client, list_url, client.get(list_url))
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 1)
+        assert_modified(client, title_url, title_etag)
+        assert_modified(client, list_url, list_etag)
+
+        title_etag = client.get(title_url)['ETag']
+        category = Category.objects.get(slug=titles[0]['category'])
+        category.name = 'Кинофильм'
+        category.save()
+        assert_modified(client, title_url, title_etag)
+
+        response = client.get(f'{list_url}?year=1984')
+        assert_not_modified(client, f'{list_url}?year=1984', response)
+        assert response['ETag'] != client.get(list_url)['ETag']
+
+    def test_03_bulk_and_user_changes(self, client, admin_client, admin):
+        author_map = {admin: admin_client}
+        _, titles = create_reviews(admin_client, author_map)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = assert_not_modified(
+            client, reviews_url, client.get(reviews_url))
+
+        versions = dict(Title.objects.values_list('id', 'version'))
+        admin.bio = 'Новая биография'
+        admin.save()
+        assert dict(Title.objects.values_list('id', 'version')) == versions, (
+            'Проверьте, что сохранение пользователя без смены имени '
+            'не меняет версии произведений.'
+        )
+        assert_not_modified(client, reviews_url, client.get(reviews_url))
+
+        call_command('recompute_ratings', stdout=StringIO())
+        assert_modified(client, reviews_url, etag)
+
+    def test_04_titles_list_version(self, client, admin_client, admin,
+                                    monkeypatch):
+        author_map = {admin: admin_client}
+        _, titles = create_reviews(admin_client, author_map)
+        list_url = '/api/v1/titles/?pagination=cursor'
+        response = client.get(list_url)
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(
+                list_url, HTTP_IF_NONE_MATCH=response['ETag']
+            ).status_code == HTTPStatus.NOT_MODIFIED
+        assert not context.captured_queries, (
+            'Проверьте, что версия списка произведений не считается '
+            'по таблице произведений.'
+        )
+        now = ratings.time.time_ns()
+        monkeypatch.setattr(
+            ratings.time, 'time_ns', lambda: now + 2 * 10 ** 9)
+        Title.objects.get(id=titles[-1]['id']).delete()
+        response = client.get(
+            list_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление произведения меняет Last-Modified '
+            'списка.'
+        )
@@ -0,0 +1,98 @@
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+from reviews.generators import SyntheticData
+from reviews.models import Comment, Title, User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Benchmark:
+
+    def test_01_report_covers_routes(self):
+        SyntheticData(seed=1).generate(
+            users=3, titles=5, reviews=10, comments=10
+        )
+        output = StringIO()
+        call_command(
+            'benchmark_api', use_existing_db=True, requests=2,
+            stdout=output, stderr=StringIO(),
+        )
+        report = json.loads(output.getvalue())
+        assert report['dataset']['Title'] == 5
+        routes = {route['route']: route for route in report['routes']}
+        for name in ('titles-list', 'titles-detail', 'categories-list',
+                     'genres-list', 'reviews-list', 'reviews-detail',
+                     'comments-list', 'comments-detail', 'users-list',
+                     'users-detail', 'users-user-info'):
+            assert name in routes, (
+                f'Проверьте, что `benchmark_api` замеряет маршрут `{name}`.'
+            )
+            route = routes[name]
+            assert route['status'] == HTTPStatus.OK
+            for key in ('p50_ms', 'p95_ms', 'queries', 'peak_memory_kb'):
+                assert key in route
+        assert not User.objects.filter(
+            username='benchmark_admin').exists(), (
+            'Проверьте, что `benchmark_api` удаляет созданного для '
+            'замеров администратора.'
+        )
+
+    def test_02_generate_data(self):
+        call_command(
+            'generate_data', users=20, titles=30, reviews=200, comments=300,
+            seed=7, stdout=StringIO(),
+        )
+        assert Title.objects.count() == 30
+        assert User.objects.count() == 20
+        reviews_per_title = sorted(
+            Title.objects.annotate(count=Count('reviews')).values_list(
+                'count', flat=True),
+            reverse=True,
+        )
+        assert reviews_per_title[0] > reviews_per_title[-1], (
+            'Проверьте, что `generate_data` распределяет отзывы по '
+            'произведениям неравномерно.'
+        )
+        assert reviews_per_title[0] <= 20
+        assert Comment.objects.exists()
+        for title in Title.objects.annotate(count=Count('reviews')):
+            assert title.rating_count == title.count, (
+                'Проверьте, что после `generate_data` пересчитан рейтинг.'
+            )
+
+    def test_03_empty_database(self):
+        output = StringIO()
+        call_command(
+            'benchmark_api', use_existing_db=True, requests=1,
+            stdout=output, stderr=StringIO(),
+        )
+        routes = {
+            route['route'] for route in json.loads(output.getvalue())['routes']
+        }
+        assert 'titles-list' in routes
+        assert 'titles-detail' not in routes, (
+            'Проверьте, что `benchmark_api` пропускает маршруты объектов, '
+            'которых нет в БД.'
+        )
+
+    def test_04_generate_data_counts(self):
+        User.objects.create(username='existing', email='e@yamdb.fake')
+        output = StringIO()
+        call_command(
+            'generate_data', users=3, titles=2, reviews=2, comments=2,
+            stdout=output,
+        )
+        assert 'пользователей 3,' in output.getvalue(), (
+            'Проверьте, что `generate_data` сообщает только о созданных '
+            'пользователях.'
+        )
+        with pytest.raises(CommandError):
+            call_command(
+                'generate_data', users=1, titles=1, reviews=1, comments=1,
+                pareto=1, stdout=StringIO(),
+            )
@@ -0,0 +1,32 @@
+import json
+import logging
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16SQLProfiling:
+
+    def test_01_disabled_by_default(self, client):
+        response = client.get('/api/v1/titles/')
+        assert not response.has_header('Server-Timing')
+
+    def test_02_server_timing_and_slow_log(self, settings, client,
+                                           admin_client, caplog):
+        create_titles(admin_client)
+        settings.SQL_PROFILING = True
+        settings.SQL_PROFILING_SLOW_REQUEST_MS = 0
+        with caplog.at_level(logging.WARNING, logger='api.slow_requests'):
+            response = client.get('/api/v1/titles/')
+        timing = response['Server-Timing']
+        assert timing.startswith('db;dur=') and 'queries' in timing, (
+            'Проверьте, что при включённом SQL_PROFILING ответ содержит '
+            'заголовок Server-Timing с временем запросов к БД.'
+        )
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['path'] == '/api/v1/titles/'
+        assert record['queries'] >= 1
+        assert record['slowest'] and 'sql' in record['slowest'][0]
+        assert isinstance(record['duplicates'], list)
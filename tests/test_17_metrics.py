@@ -0,0 +1,118 @@
+import re
+import threading
+from http import HTTPStatus
+
+import pytest
+from api.metrics import MetricsRegistry
+from reviews.models import QueuedMail
+
+
+def get_sample(content, name):
+    match = re.search(
+        rf'^{re.escape(name)} ([0-9.e+-]+)$', content, re.MULTILINE)
+    assert match, f'Проверьте, что `/metrics` содержит метрику `{name}`.'
+    return float(match.group(1))
+
+
+TOKEN = 'metrics-token'
+AUTHORIZATION = f'Bearer {TOKEN}'
+
+
+@pytest.fixture
+def metrics_settings(settings):
+    settings.METRICS_ENABLED = True
+    settings.METRICS_TOKEN = TOKEN
+    return settings
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Metrics:
+
+    def test_01_metrics_endpoint(self, client, metrics_settings):
+        client.get('/api/v1/categories/')
+        client.get('/api/v1/categories/')
+        QueuedMail.objects.create(
+            subject='Тема', body='Текст', from_email='from@yamdb.fake',
+            to='to@yamdb.fake',
+        )
+        response = client.get('/metrics', HTTP_AUTHORIZATION=AUTHORIZATION)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain')
+        content = response.content.decode()
+        route = 'route="api:categories-list"'
+        assert get_sample(
+            content,
+            f'api_requests_total{{{route},method="GET",status="200"}}',
+        ) >= 2, (
+            'Проверьте, что `/metrics` считает запросы по маршрутам.'
+        )
+        assert get_sample(
+            content,
+            f'api_request_duration_seconds_bucket{{{route},le="+Inf"}}',
+        ) >= 2
+        assert get_sample(content, f'api_db_queries_total{{{route}}}') >= 1
+        assert 0 < get_sample(content, 'api_list_cache_hit_ratio') <= 1
+        assert get_sample(content, 'api_mail_queue_depth') == 1
+
+    def test_02_metrics_forbidden_from_external_ip(
+        self, client, metrics_settings,
+    ):
+        response = client.get(
+            '/metrics', REMOTE_ADDR='203.0.113.1',
+            HTTP_AUTHORIZATION=AUTHORIZATION,
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что `/metrics` недоступен с внешних адресов.'
+        )
+
+    def test_03_registry_merges_threads(self):
+        registry = MetricsRegistry((0.1, 1))
+
+        def observe():
+            for duration in (0.05, 0.5, 5):
+                registry.observe('route', 'GET', 200, duration, 2)
+
+        threads = [threading.Thread(target=observe) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        requests, durations, duration_sums, queries = registry.collect()
+        assert requests['route', 'GET', 200] == 12
+        assert durations['route'] == [4, 4, 4]
+        assert queries['route'] == 24
+        assert duration_sums['route'] == pytest.approx(4 * 5.55)
+
+    def test_04_metrics_token(self, client, metrics_settings):
+        assert client.get('/metrics').status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что `/metrics` требует токен даже с внутренних '
+            'адресов: за прокси все запросы приходят с 127.0.0.1.'
+        )
+        assert client.get(
+            '/metrics', HTTP_AUTHORIZATION='Bearer wrong'
+        ).status_code == HTTPStatus.FORBIDDEN
+        metrics_settings.METRICS_TOKEN = ''
+        assert client.get(
+            '/metrics', HTTP_AUTHORIZATION='Bearer '
+        ).status_code == HTTPStatus.FORBIDDEN
+
+    def test_05_metrics_disabled(self, client, settings):
+        settings.METRICS_ENABLED = False
+        settings.METRICS_TOKEN = TOKEN
+        assert client.get(
+            '/metrics', HTTP_AUTHORIZATION=AUTHORIZATION
+        ).status_code == HTTPStatus.NOT_FOUND
+
+    def test_06_unknown_methods_grouped(self, client, metrics_settings):
+        for method in ('PROPFIND', 'X-RANDOM'):
+            client.generic(method, '/api/v1/categories/')
+        content = client.get(
+            '/metrics', HTTP_AUTHORIZATION=AUTHORIZATION).content.decode()
+        assert get_sample(
+            content,
+            'api_requests_total{route="api:categories-list",'
+            'method="other",status="401"}',
+        ) == 2, (
+            'Проверьте, что нестандартные методы учитываются как `other`.'
+        )
+        assert 'PROPFIND' not in content
@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+import pytest
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleSearch:
+
+    @staticmethod
+    def search(client, query):
+        response = client.get('/api/v1/titles/', {'search': query})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_ranked(self, client):
+        Title.objects.create(
+            name='Толстой', year=2000, description='Книга про мир')
+        Title.objects.create(name='Мир', year=2000)
+        Title.objects.create(name='Война', year=2000, description='Роман')
+        assert self.search(client, 'мир') == ['Мир', 'Толстой'], (
+            'Проверьте, что параметр `search` ищет по названию и описанию '
+            'и сортирует результат по релевантности.'
+        )
+        assert self.search(client, 'тол') == ['Толстой'], (
+            'Проверьте, что поиск находит слова по началу.'
+        )
+        assert self.search(client, '"мир*: (') == ['Мир', 'Толстой'], (
+            'Проверьте, что спецсимволы в запросе не ломают поиск.'
+        )
+
+    def test_02_index_in_sync(self, client):
+        title = Title.objects.create(name='Война и мир', year=1869)
+        title.name = 'Анна Каренина'
+        title.save()
+        assert self.search(client, 'война') == []
+        assert self.search(client, 'анна') == ['Анна Каренина'], (
+            'Проверьте, что индекс поиска обновляется при изменении '
+            'произведения.'
+        )
+        title.delete()
+        assert self.search(client, 'анна') == [], (
+            'Проверьте, что индекс поиска обновляется при удалении '
+            'произведения.'
+        )
+
+    def test_03_no_words(self, client):
+        Title.objects.create(name='Мир', year=2000)
+        for query in ('!!', '"'):
+            assert self.search(client, query) == [], (
+                'Проверьте, что запрос без слов возвращает пустой список.'
+            )
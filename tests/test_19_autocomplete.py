@@ -0,0 +1,59 @@
+from http import HTTPStatus
+
+import pytest
+from api.autocomplete import autocomplete_index
+from reviews.models import Category, Genre, Title
+
+URL = '/api/v1/autocomplete/'
+
+
+def get_titles(client, query):
+    """Подсказки после перестройки индекса, которую запустил запрос."""
+    client.get(URL, {'q': query})
+    autocomplete_index.wait()
+    return client.get(URL, {'q': query}).json()['titles']
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Autocomplete:
+
+    def test_01_prefix_matches(self, client):
+        category = Category.objects.create(name='Фильмы', slug='films')
+        Genre.objects.create(name='Фэнтези', slug='fantasy')
+        Title.objects.create(name='Война и мир', year=1869, category=category)
+        Title.objects.create(name='Мир', year=2000)
+        Title.objects.create(name='Миранда', year=2001)
+        response = client.get(URL, {'q': 'мир'})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [title['name'] for title in data['titles']] == [
+            'Мир', 'Война и мир', 'Миранда',
+        ], (
+            f'Проверьте, что `{URL}` ищет по началу каждого слова названия.'
+        )
+        assert data['genres'] == [] and data['categories'] == []
+        data = client.get(URL, {'q': 'Ф', 'type': 'genres'}).json()
+        assert data == {'genres': [{'name': 'Фэнтези', 'slug': 'fantasy'}]}
+        data = client.get(URL, {'q': 'мир', 'limit': 1}).json()
+        assert len(data['titles']) == 1
+
+    def test_02_index_refreshed_on_change(self, client):
+        assert client.get(URL, {'q': 'ан'}).json()['titles'] == []
+        title = Title.objects.create(name='Анна Каренина', year=1877)
+        assert client.get(URL, {'q': 'кар'}).json()['titles'] == [], (
+            'Проверьте, что пока индекс перестраивается, запросы '
+            'получают прежний индекс.'
+        )
+        assert get_titles(client, 'кар') == [
+            {'id': title.id, 'name': 'Анна Каренина', 'year': 1877},
+        ], (
+            'Проверьте, что индекс подсказок обновляется при изменениях.'
+        )
+        title.delete()
+        assert get_titles(client, 'ан') == []
+
+    @pytest.mark.parametrize('params', (
+        {}, {'q': 'а', 'limit': 0}, {'q': 'а', 'type': 'users'},
+    ))
+    def test_03_bad_params(self, client, params):
+        assert client.get(URL, params).status_code == HTTPStatus.BAD_REQUEST
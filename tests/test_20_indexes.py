@@ -0,0 +1,45 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError
+from reviews.generators import SyntheticData
+from reviews.models import Genre, GenreTitle, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Indexes:
+
+    @pytest.mark.parametrize('route, index', (
+        ('reviews-list', 'review_title_pub_date_idx'),
+        ('comments-list', 'comment_review_pub_date_idx'),
+        ('titles-list', 'title_name_id_idx'),
+    ))
+    def test_01_routes_use_composite_indexes(self, route, index):
+        SyntheticData(seed=1).generate(
+            users=3, titles=5, reviews=10, comments=10
+        )
+        output = StringIO()
+        call_command(
+            'benchmark_api', use_existing_db=True, requests=1, explain=True,
+            stdout=output, stderr=StringIO(),
+        )
+        routes = {
+            item['route']: item
+            for item in json.loads(output.getvalue())['routes']
+        }
+        plans = ' '.join(
+            ' '.join(query['plan']) for query in routes[route]['plans']
+        )
+        assert index in plans, (
+            f'Проверьте, что запросы маршрута `{route}` используют '
+            f'индекс `{index}`.'
+        )
+
+    def test_02_genre_title_unique(self):
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(name='Гамлет', year=1600)
+        GenreTitle.objects.create(genre=genre, title=title)
+        with pytest.raises(IntegrityError):
+            GenreTitle.objects.create(genre=genre, title=title)
@@ -0,0 +1,76 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from http import HTTPStatus
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.management import call_command
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.renderers import FastJSONParser, FastJSONRenderer
+from reviews.generators import SyntheticData
+
+DATA = {
+    'results': [{
+        'id': 1,
+        'text': 'Текст с разделителем\u2028строк',
+        'pub_date': datetime(2023, 7, 11, 3, 6, 1, 123456, timezone.utc),
+        'score': Decimal('7.50'),
+        'rating': None,
+        'genre': [{'slug': 'drama'}],
+    }],
+    1: 'ключ-число',
+}
+
+
+class Test21JSON:
+
+    def test_01_renderer_matches_stdlib(self):
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(
+            DATA), (
+            'Проверьте, что FastJSONRenderer выдаёт те же байты, '
+            'что и JSONRenderer.'
+        )
+        assert FastJSONRenderer().render(
+            DATA, 'application/json; indent=4'
+        ) == JSONRenderer().render(DATA, 'application/json; indent=4')
+
+    def test_02_fallback_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+        content = JSONRenderer().render(DATA)
+        assert FastJSONParser().parse(BytesIO(content)) == json.loads(content)
+
+    def test_03_parser(self):
+        content = JSONRenderer().render(DATA)
+        assert FastJSONParser().parse(BytesIO(content)) == json.loads(content)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_bad_json(self, client):
+        response = client.post(
+            '/api/v1/auth/signup/', data='{"username":',
+            content_type='application/json',
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'JSON parse error' in response.json()['detail']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_benchmark(self):
+        SyntheticData(seed=1).generate(
+            users=3, titles=5, reviews=10, comments=10
+        )
+        output = StringIO()
+        call_command(
+            'benchmark_json', use_existing_db=True, requests=2,
+            stdout=output, stderr=StringIO(),
+        )
+        payloads = json.loads(output.getvalue())['payloads']
+        assert [payload['route'] for payload in payloads] == [
+            'titles-list', 'reviews-list', 'comments-list',
+        ]
+        for payload in payloads:
+            assert set(payload['render_us']) == {
+                'JSONRenderer', 'FastJSONRenderer',
+            }
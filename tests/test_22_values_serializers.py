@@ -0,0 +1,54 @@
+import pytest
+from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+from reviews.generators import SyntheticData
+from reviews.models import Comment, Genre, Review, Title, User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22ValuesSerializers:
+
+    @staticmethod
+    def get_urls():
+        review = Review.objects.filter(comments__isnull=False).first()
+        comment = review.comments.first()
+        reviews = f'/api/v1/titles/{review.title_id}/reviews/'
+        comments = f'{reviews}{review.id}/comments/'
+        return (
+            '/api/v1/titles/',
+            '/api/v1/titles/?pagination=cursor',
+            '/api/v1/titles/?search=Особое',
+            f'/api/v1/titles/{review.title_id}/',
+            f'/api/v1/titles/{Title.objects.get(name="Особое").id}/',
+            reviews,
+            f'{reviews}?pagination=cursor',
+            f'{reviews}{review.id}/',
+            comments,
+            f'{comments}{comment.id}/',
+        )
+
+    def test_01_same_json_as_serializers(self, client, monkeypatch):
+        SyntheticData(seed=3).generate(
+            users=5, titles=8, reviews=20, comments=30
+        )
+        title = Title.objects.create(
+            name='Особое', year=2000, description='"Кавычки" и разрыв')
+        title.genre.set(Genre.objects.all()[:3])
+        review = Review.objects.create(
+            title=title, author=User.objects.first(), text='Текст', score=7)
+        Comment.objects.create(
+            review=review, author=User.objects.first(), text='Ответ')
+        urls = self.get_urls()
+        fast = [client.get(url) for url in urls]
+        for viewset in (TitleViewSet, ReviewViewSet, CommentViewSet):
+            monkeypatch.setattr(viewset, 'values_serializer_class', None)
+        for url, response in zip(urls, fast):
+            expected = client.get(url)
+            assert response.status_code == expected.status_code
+            assert response.content == expected.content, (
+                f'Проверьте, что быстрая сериализация `{url}` выдаёт тот '
+                'же JSON, что и сериализатор представления.'
+            )
+
+    def test_02_missing_objects(self, client):
+        for url in ('/api/v1/titles/0/', '/api/v1/titles/abc/'):
+            assert client.get(url).status_code == 404
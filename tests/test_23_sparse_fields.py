@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Review, Title
+
+from tests.test_09_queries import create_titles_orm
+
+
+def get_with_queries(client, url, params):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+    assert response.status_code == HTTPStatus.OK
+    return response.json(), [
+        query['sql'] for query in context.captured_queries
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23SparseFields:
+
+    def test_01_title_fields_trim_queries(self, client):
+        create_titles_orm(3)
+        _, full_queries = get_with_queries(client, '/api/v1/titles/', {})
+        data, queries = get_with_queries(
+            client, '/api/v1/titles/', {'fields': 'id,name,rating'})
+        assert [set(title) for title in data['results']] == [
+            {'id', 'name', 'rating'}
+        ] * 3, (
+            'Проверьте, что параметр `fields` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        assert len(queries) == len(full_queries) - 1, (
+            'Проверьте, что без поля `genre` жанры не запрашиваются.'
+        )
+        assert not any('description' in sql for sql in queries), (
+            'Проверьте, что невыбранные колонки не читаются из БД.'
+        )
+        title = data['results'][0]['id']
+        data, _ = get_with_queries(
+            client, f'/api/v1/titles/{title}/',
+            {'omit': 'genre,category,description'},
+        )
+        assert list(data) == ['id', 'name', 'year', 'rating']
+
+    def test_02_review_fields_with_cursor(self, admin_client, admin):
+        create_titles_orm(1)
+        title = Title.objects.get()
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=5)
+        data, queries = get_with_queries(
+            admin_client, f'/api/v1/titles/{title.id}/reviews/',
+            {'fields': 'id,score', 'pagination': 'cursor'},
+        )
+        assert data['results'] == [{'id': review.id, 'score': 5}]
+        assert not any('"text"' in sql for sql in queries)
+
+    def test_03_user_fields(self, admin_client, admin):
+        data, queries = get_with_queries(
+            admin_client, '/api/v1/users/', {'fields': 'username,role'})
+        assert data['results'] == [
+            {'username': admin.username, 'role': 'admin'}
+        ]
+        # Первый запрос загружает пользователя из токена целиком.
+        assert '"bio"' not in queries[-1]
+        data, _ = get_with_queries(
+            admin_client, '/api/v1/users/me/', {'omit': 'bio,email'})
+        assert set(data) == {'username', 'first_name', 'last_name', 'role'}
+
+    @pytest.mark.parametrize('url', ('/api/v1/titles/', '/api/v1/users/'))
+    def test_04_unknown_fields(self, admin_client, url):
+        response = admin_client.get(url, {'fields': 'id,password'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неизвестные поля в `fields` дают ошибку 400.'
+        )
@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.authentication import UserCache
+from reviews.models import User
+
+
+def count_user_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response, sum(
+        '"reviews_user"' in query['sql']
+        for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24UserCache:
+
+    def test_01_user_loaded_once(self, admin_client):
+        _, queries = count_user_queries(admin_client, '/api/v1/titles/')
+        assert queries == 1
+        _, queries = count_user_queries(admin_client, '/api/v1/titles/')
+        assert queries == 0, (
+            'Проверьте, что пользователь из токена берётся из кэша.'
+        )
+
+    def test_02_role_change_invalidates(self, admin_client, admin):
+        assert admin_client.get('/api/v1/users/').status_code == HTTPStatus.OK
+        admin.role = 'user'
+        admin.save()
+        assert admin_client.get('/api/v1/users/').status_code == (
+            HTTPStatus.FORBIDDEN
+        ), (
+            'Проверьте, что смена роли пользователя сбрасывает кэш.'
+        )
+
+    def test_03_inactive_and_deleted(self, admin_client, admin):
+        assert admin_client.get('/api/v1/users/').status_code == HTTPStatus.OK
+        admin.is_active = False
+        admin.save()
+        assert admin_client.get('/api/v1/users/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        admin.is_active = True
+        admin.save()
+        assert admin_client.get('/api/v1/users/').status_code == HTTPStatus.OK
+        admin.delete()
+        assert admin_client.get('/api/v1/users/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_04_cache_bounds(self):
+        cache = UserCache(size=2, ttl=60)
+        for user_id in range(3):
+            cache.set(user_id, user_id)
+        assert cache.get(0) is None
+        assert cache.get(2) == 2
+        cache = UserCache(size=2, ttl=-1)
+        cache.set(1, 1)
+        assert cache.get(1) is None
+
+    def test_05_patch_me_uses_fresh_user(self, user_client, user):
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK
+        )
+        User.objects.filter(pk=user.pk).update(
+            role='moderator', token_version=5)
+        response = user_client.patch('/api/v1/users/me/', {'bio': 'Био'})
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert (user.bio, user.role, user.token_version) == (
+            'Био', 'moderator', 5
+        ), (
+            'Проверьте, что изменение профиля не записывает в БД '
+            'устаревшие поля пользователя из кэша.'
+        )
@@ -0,0 +1,104 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.authentication import get_access_token
+from reviews.models import User
+
+
+def get_client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {get_access_token(user)}')
+    return client
+
+
+def count_user_queries(client, method, url, data=None):
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, data=data)
+    return response, sum(
+        '"reviews_user"' in query['sql']
+        for query in context.captured_queries
+    )
+
+
+@pytest.fixture
+def role_claims(settings):
+    settings.JWT_ROLE_CLAIMS = True
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('role_claims')
+class Test25TokenClaims:
+
+    def test_01_permissions_without_user_row(self, admin):
+        client = get_client(admin)
+        response, _ = count_user_queries(
+            client, 'post', '/api/v1/categories/',
+            {'name': 'Фильм', 'slug': 'film'},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response, queries = count_user_queries(
+            client, 'post', '/api/v1/genres/',
+            {'name': 'Драма', 'slug': 'drama'},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert queries == 0, (
+            'Проверьте, что с ролью в токене проверка прав администратора '
+            'не читает пользователя из БД.'
+        )
+
+    def test_02_profile_loaded_lazily(self, admin):
+        response = get_client(admin).get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == admin.email
+
+    def test_03_role_change_revokes_token(self, admin):
+        client = get_client(admin)
+        assert client.get('/api/v1/users/').status_code == HTTPStatus.OK
+        user = User.objects.get(pk=admin.pk)
+        user.role = 'user'
+        user.save()
+        assert client.get('/api/v1/users/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что смена роли отзывает токены с прежней ролью.'
+        )
+        assert get_client(user).get('/api/v1/users/').status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+
+    def test_04_revoke_tokens(self, user):
+        client = get_client(user)
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
+        user.revoke_tokens()
+        assert client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        client = get_client(user)
+        user.delete()
+        assert client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_05_author_permission(self, user, admin):
+        client = get_client(admin)
+        response = client.post(
+            '/api/v1/categories/', {'name': 'Книга', 'slug': 'book'})
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.post('/api/v1/titles/', {
+            'name': 'Роман', 'year': 2000, 'category': 'book', 'genre': [],
+        })
+        title_id = response.json()['id']
+        author = get_client(user)
+        response = author.post(
+            f'/api/v1/titles/{title_id}/reviews/',
+            {'text': 'Отзыв', 'score': 5},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        url = f'/api/v1/titles/{title_id}/reviews/{response.json()["id"]}/'
+        assert author.patch(url, {'score': 6}).status_code == HTTPStatus.OK, (
+            'Проверьте, что автор с токеном с ролью может изменить свой отзыв.'
+        )
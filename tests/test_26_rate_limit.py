@@ -0,0 +1,154 @@
+import warnings
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api import ratelimit
+from api.ratelimit import (
+    CacheRateLimitBackend, LocalRateLimitBackend, parse_rate,
+)
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+
+
+@pytest.fixture
+def limits(settings):
+    settings.RATE_LIMITS = {
+        'signup': {'ip': '3/min', 'username': '2/min', 'email': '2/min'},
+        'token': {'ip': '3/min', 'username': '2/min'},
+    }
+    return settings
+
+
+def signup(client, username):
+    return client.post(SIGNUP_URL, data={
+        'username': username, 'email': f'{username}@yamdb.fake',
+    })
+
+
+class Test26RateLimit:
+
+    def test_01_parse_rate(self):
+        assert parse_rate('5/min') == (5, 5 / 60)
+        assert parse_rate('1/s') == (1, 1)
+        with pytest.raises(ValueError):
+            parse_rate('5/week')
+
+    @pytest.mark.parametrize(
+        'backend', (LocalRateLimitBackend, CacheRateLimitBackend))
+    def test_02_backend(self, backend, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(ratelimit.time, 'monotonic', lambda: now[0])
+        monkeypatch.setattr(ratelimit.time, 'time', lambda: now[0])
+        backend = backend()
+        assert backend.take('key', 2, 1) == 0
+        assert backend.take('key', 2, 1) == 0
+        assert backend.take('key', 2, 1) == pytest.approx(1), (
+            'Проверьте, что пустая корзина возвращает время ожидания.'
+        )
+        assert backend.take('other', 2, 1) == 0
+        now[0] += 1
+        assert backend.take('key', 2, 1) == 0, (
+            'Проверьте, что корзина пополняется со временем.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_signup_limited_by_username(self, client, limits):
+        for _ in range(2):
+            assert signup(client, 'user').status_code == HTTPStatus.OK
+        with CaptureQueriesContext(connection) as context:
+            response = signup(client, 'USER')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что частые запросы кода для одного имени '
+            'отклоняются с кодом 429.'
+        )
+        assert int(response['Retry-After']) > 0
+        assert not context.captured_queries, (
+            'Проверьте, что ограничение проверяется до обращения к БД.'
+        )
+        assert signup(
+            client.__class__(REMOTE_ADDR='10.0.0.1'), 'user'
+        ).status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что лимит по имени действует для всех адресов.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_signup_limited_by_ip(self, client, limits):
+        for username in ('first', 'second', 'third'):
+            assert signup(client, username).status_code == HTTPStatus.OK
+        assert signup(client, 'fourth').status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+        assert signup(
+            client.__class__(REMOTE_ADDR='10.0.0.1'), 'fourth'
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит по IP считается для каждого адреса.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_forwarded_for_ignored(self, client, limits):
+        for number in range(3):
+            assert client.post(SIGNUP_URL, data={
+                'username': f'user{number}',
+                'email': f'user{number}@yamdb.fake',
+            }, HTTP_X_FORWARDED_FOR=f'10.0.0.{number}').status_code == (
+                HTTPStatus.OK
+            )
+        assert signup(client, 'fourth').status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        ), (
+            'Проверьте, что заголовок X-Forwarded-For без доверенных '
+            'прокси не меняет IP-адрес для ограничения.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_not_object_body(self, client, limits):
+        response = client.post(
+            SIGNUP_URL, data='[]', content_type='application/json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что тело запроса не в виде объекта приводит '
+            'к ответу 400.'
+        )
+
+    def test_07_local_backend_bounded(self, settings):
+        settings.RATE_LIMIT_MAX_KEYS = 2
+        backend = LocalRateLimitBackend()
+        for key in ('first', 'second', 'third'):
+            backend.take(key, 1, 1)
+        assert list(backend.buckets) == ['second', 'third'], (
+            'Проверьте, что давно не использованные корзины вытесняются.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_08_token_limited(self, client, limits):
+        data = {'username': 'user', 'confirmation_code': '00000'}
+        for _ in range(2):
+            assert client.post(TOKEN_URL, data=data).status_code == (
+                HTTPStatus.NOT_FOUND
+            )
+        assert client.post(TOKEN_URL, data=data).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_09_cache_backend(self, client, limits):
+        limits.RATE_LIMIT_BACKEND = 'api.ratelimit.CacheRateLimitBackend'
+        for _ in range(2):
+            assert signup(client, 'user').status_code == HTTPStatus.OK
+        assert signup(client, 'user').status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_10_cache_key_hashed(self, client, limits):
+        limits.RATE_LIMIT_BACKEND = 'api.ratelimit.CacheRateLimitBackend'
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            response = signup(client, 'имя с пробелами ' + 'x' * 300)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что значения из тела запроса не попадают в ключ '
+            'кэша как есть.'
+        )
@@ -0,0 +1,113 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Comment, Review, Title
+
+from tests.test_09_queries import create_titles_orm
+
+FIELDS = {'fields': 'id,can_edit,can_delete'}
+
+
+def get_actions(client, url, params=FIELDS):
+    response = client.get(url, params)
+    assert response.status_code == HTTPStatus.OK
+    return {
+        item['id']: (item['can_edit'], item.get('can_delete'))
+        for item in response.json()['results']
+    }
+
+
+@pytest.fixture
+def reviews(user, moderator, admin):
+    create_titles_orm(1)
+    title = Title.objects.get()
+    return title, [
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5)
+        for author in (user, moderator, admin)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27ObjectActions:
+
+    def test_01_fields_are_optional(self, user_client, reviews):
+        title, _ = reviews
+        response = user_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert 'can_edit' not in response.json()['results'][0], (
+            'Проверьте, что поля `can_edit` и `can_delete` выводятся '
+            'только по запросу.'
+        )
+
+    def test_02_by_role(
+        self, client, user_client, moderator_client, reviews,
+    ):
+        title, (own, other, another) = reviews
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        assert get_actions(user_client, url) == {
+            own.id: (True, True),
+            other.id: (False, False),
+            another.id: (False, False),
+        }, (
+            'Проверьте, что пользователь может менять только свои отзывы.'
+        )
+        assert set(get_actions(moderator_client, url).values()) == {
+            (True, True)
+        }, (
+            'Проверьте, что модератор может менять все отзывы.'
+        )
+        assert set(get_actions(client, url).values()) == {(False, False)}
+
+    def test_03_no_extra_queries(self, user_client, reviews):
+        title, _ = reviews
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        user_client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            user_client.get(url, {'fields': 'id,text'})
+        with CaptureQueriesContext(connection) as actions_context:
+            get_actions(user_client, url, {'fields': 'id,text,can_edit'})
+        assert len(actions_context) == len(context), (
+            'Проверьте, что права считаются без дополнительных запросов.'
+        )
+
+    def test_04_comments(self, user_client, user, admin, reviews):
+        title, (review, *_) = reviews
+        own, other = (
+            Comment.objects.create(review=review, author=author, text='К')
+            for author in (user, admin)
+        )
+        assert get_actions(
+            user_client,
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+        ) == {own.id: (True, True), other.id: (False, False)}
+
+    def test_05_etag_per_user(
+        self, user_client, moderator_client, user, reviews,
+    ):
+        title, _ = reviews
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.get(url, FIELDS)
+        etag = response['ETag']
+        assert 'Authorization' in response['Vary'], (
+            'Проверьте, что ответ с полями прав зависит от Authorization.'
+        )
+        assert 'Last-Modified' not in response
+        assert user_client.get(
+            url, FIELDS, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.NOT_MODIFIED
+        assert moderator_client.get(
+            url, FIELDS, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag ответа с полями прав зависит '
+            'от пользователя.'
+        )
+        user.role = 'moderator'
+        user.save()
+        assert user_client.get(
+            url, FIELDS, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что смена роли меняет ETag.'
+        )
+        assert 'Authorization' not in user_client.get(url).get('Vary', '')
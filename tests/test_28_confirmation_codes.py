@@ -0,0 +1,101 @@
+import re
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from reviews.codes import hash_code
+from reviews.models import ConfirmationCode, QueuedMail, User
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+DATA = {'username': 'user', 'email': 'user@yamdb.fake'}
+
+
+def signup(client):
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(SIGNUP_URL, data=DATA)
+    assert response.status_code == HTTPStatus.OK
+    code = re.search(
+        r'код подтверждения: (\w+)', QueuedMail.objects.last().body)[1]
+    return code, [query['sql'] for query in context.captured_queries]
+
+
+def get_token(client, code):
+    return client.post(TOKEN_URL, data={
+        'username': DATA['username'], 'confirmation_code': code,
+    })
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28ConfirmationCodes:
+
+    def test_01_code_hashed(self, client):
+        code, _ = signup(client)
+        stored = ConfirmationCode.objects.get()
+        assert stored.code_hash == hash_code(code) != code, (
+            'Проверьте, что код подтверждения хранится в виде хэша.'
+        )
+        assert stored.expires > timezone.now()
+
+    def test_02_user_row_not_rewritten(self, client):
+        signup(client)
+        code, queries = signup(client)
+        assert not any(
+            sql.startswith('UPDATE "reviews_user"') for sql in queries
+        ), (
+            'Проверьте, что повторный запрос кода не перезаписывает '
+            'строку пользователя.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            get_token(client, 'WRONG')
+        assert not any(
+            query['sql'].startswith('UPDATE "reviews_user"')
+            for query in context.captured_queries
+        )
+        assert get_token(client, code).status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неверный код гасит действующий.'
+        )
+
+    def test_03_code_single_use(self, client):
+        code, _ = signup(client)
+        response = get_token(client, code)
+        assert response.status_code == HTTPStatus.OK
+        assert 'token' in response.json()
+        assert get_token(client, code).status_code == HTTPStatus.BAD_REQUEST
+        assert not ConfirmationCode.objects.exists()
+
+    def test_04_expired_code(self, client, settings):
+        code, _ = signup(client)
+        ConfirmationCode.objects.update(
+            expires=timezone.now() - timedelta(seconds=1))
+        assert get_token(client, code).status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что просроченный код не действует.'
+        )
+
+    def test_05_clear_command(self, client):
+        signup(client)
+        signup(client)
+        call_command('send_queued_mail', stdout=StringIO())
+        assert not QueuedMail.objects.exclude(body='').exists(), (
+            'Проверьте, что текст отправленного письма с кодом стирается.'
+        )
+        QueuedMail.objects.filter(id=QueuedMail.objects.last().id).update(
+            sent=None, body='Код')
+        other = User.objects.create(username='other', email='o@yamdb.fake')
+        ConfirmationCode.objects.create(
+            user=other, code_hash='', expires=timezone.now())
+        output = StringIO()
+        call_command('clear_confirmation_codes', stdout=output)
+        assert 'кодов: 1, отправленных писем: 1' in output.getvalue()
+        assert QueuedMail.objects.get().body == 'Код', (
+            'Проверьте, что команда удаляет только отправленные письма.'
+        )
+        assert list(ConfirmationCode.objects.values_list(
+            'user__username', flat=True)) == [DATA['username']], (
+            'Проверьте, что команда удаляет только просроченные коды.'
+        )